@@ -1,8 +1,22 @@
+import os
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
 
 class HttpClient:
-    def __init__(self):
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None, key: str = "default"):
+        # HttpClientPool 키 (디버그 파일 이름 등 계정별로 구분해야 하는 곳에서 사용)
+        self.key = key
+
+        # www/ol/el 서브도메인별 keep-alive 커넥션을 재사용하도록 어댑터 크기 설정
+        self.pool_connections = pool_connections or int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+        self.pool_maxsize = pool_maxsize or int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+
         self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
 
     def __del__(self):
         self.session.close()
@@ -23,11 +37,62 @@ class HttpClient:
         res.raise_for_status()
         return res
 
+    def stats(self) -> dict:
+        """
+        커넥션 재사용 통계
+
+        Returns:
+            {"requests": 전체 요청 수, "opened": 새로 연 커넥션 수, "reused": 재사용된 요청 수, "hosts": {host: {...}}}
+        """
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[pool.host] = {
+                "requests": pool.num_requests,
+                "opened": pool.num_connections,
+                "reused": max(pool.num_requests - pool.num_connections, 0),
+            }
+
+        return {
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "opened": sum(h["opened"] for h in hosts.values()),
+            "reused": sum(h["reused"] for h in hosts.values()),
+            "hosts": hosts,
+        }
+
+class HttpClientPool:
+    """
+    계정(또는 컨텍스트) 키별로 독립된 HttpClient(쿠키 jar 포함)를 관리하는 레지스트리
+
+    AuthController/Lotto645/Win720은 클라이언트를 받지 않으면 기본 키의 클라이언트를 공유하므로,
+    계정별로 격리된 세션을 쓰려면 HttpClientPool.get(key)로 얻은 클라이언트를 전달한다.
+    """
+
+    _clients = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(key: str = "default", pool_connections: int = None, pool_maxsize: int = None) -> HttpClient:
+        with HttpClientPool._lock:
+            client = HttpClientPool._clients.get(key)
+            if client is None:
+                client = HttpClient(pool_connections=pool_connections, pool_maxsize=pool_maxsize, key=key)
+                HttpClientPool._clients[key] = client
+            return client
+
+    @staticmethod
+    def stats() -> dict:
+        """키별 커넥션 재사용 통계"""
+        with HttpClientPool._lock:
+            clients = dict(HttpClientPool._clients)
+        return {key: client.stats() for key, client in clients.items()}
+
 class HttpClientSingleton:
-    _instance = None
+    """하위 호환용: 기본 키의 HttpClient 반환"""
 
     @staticmethod
     def get_instance():
-        if HttpClientSingleton._instance is None:
-            HttpClientSingleton._instance = HttpClient()
-        return HttpClientSingleton._instance
\ No newline at end of file
+        return HttpClientPool.get("default")
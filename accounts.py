@@ -0,0 +1,84 @@
+"""
+다중 계정 매니페스트 로더
+
+ACCOUNTS_FILE(JSON 파일) 또는 ACCOUNTS 환경변수에서 계정 목록을 읽는다.
+
+ACCOUNTS_FILE 형식:
+    [
+        {"username": "id1", "password": "pw1", "count": 5, "mode": "auto"},
+        {"username": "id2", "password": "pw2"}
+    ]
+
+ACCOUNTS 환경변수 형식:
+    - 위와 같은 JSON 문자열
+    - 또는 "id1:pw1;id2:pw2" (count/mode는 기본값 사용)
+"""
+
+import json
+import os
+
+
+def _normalize_account(raw: dict, default_count: int, default_mode: str) -> dict:
+    assert type(raw) == dict
+
+    username = raw.get("username") or raw.get("user_id")
+    password = raw.get("password")
+    if not username or not password:
+        raise ValueError("계정 항목에 username/password가 필요합니다")
+
+    return {
+        "username": str(username),
+        "password": str(password),
+        "count": int(raw.get("count", default_count)),
+        "mode": str(raw.get("mode", default_mode)).lower(),
+    }
+
+
+def _parse_accounts_text(text: str) -> list:
+    text = text.strip()
+    if not text:
+        return []
+
+    if text.startswith("["):
+        return json.loads(text)
+
+    accounts = []
+    for entry in text.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        username, _, password = entry.partition(":")
+        accounts.append({"username": username, "password": password})
+    return accounts
+
+
+def load_accounts(default_count: int = 1, default_mode: str = "auto") -> list:
+    """
+    계정 매니페스트 로드
+
+    Args:
+        default_count: 항목에 count가 없을 때 사용할 게임 수
+        default_mode: 항목에 mode가 없을 때 사용할 구매 모드
+
+    Returns:
+        계정 리스트 [{"username": ..., "password": ..., "count": ..., "mode": ...}, ...]
+        매니페스트가 없으면 빈 리스트
+    """
+    accounts_file = os.environ.get("ACCOUNTS_FILE", "")
+    accounts_env = os.environ.get("ACCOUNTS", "")
+
+    if accounts_file:
+        with open(accounts_file, "r", encoding="utf-8") as f:
+            raw_accounts = _parse_accounts_text(f.read())
+    elif accounts_env:
+        raw_accounts = _parse_accounts_text(accounts_env)
+    else:
+        return []
+
+    accounts = [_normalize_account(raw, default_count, default_mode) for raw in raw_accounts]
+
+    usernames = [account["username"] for account in accounts]
+    if len(usernames) != len(set(usernames)):
+        raise ValueError("계정 매니페스트에 중복된 username이 있습니다")
+
+    return accounts
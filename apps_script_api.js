@@ -21,8 +21,10 @@ function doGet(e) {
       });
     }
     
-    // C2:H6 범위에서 5게임 x 6번호 가져오기
-    const data = sheet.getRange("C2:H6").getValues();
+    // count 파라미터(1-10, 기본값 5)만큼 C2부터 게임당 한 행씩 6번호 가져오기 (C2:H{1+count})
+    const requested = parseInt((e && e.parameter && e.parameter.count) || "5");
+    const count = Math.min(Math.max(isNaN(requested) ? 5 : requested, 1), 10);
+    const data = sheet.getRange(2, 3, count, 6).getValues();
     
     const games = data.map((row, index) => {
       // 빈 값 제외하고 숫자로 변환
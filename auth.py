@@ -1,8 +1,10 @@
 import copy
 import json
+import time
 import requests
 from jsbn import RSAKey
-from HttpClient import HttpClientSingleton
+from HttpClient import HttpClient, HttpClientSingleton
+from session_store import SessionStore
 
 
 class AuthController:
@@ -26,8 +28,11 @@ class AuthController:
 
     _AUTH_CRED = ""
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    # 마지막 login() 호출이 어떤 경로(restored/full)를 탔는지와 소요/절약 시간
+    login_report = {}
+
+    def __init__(self, http_client: HttpClient = None):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
     def login(self, user_id: str, password: str) -> bool:
         """
@@ -43,6 +48,19 @@ class AuthController:
         assert type(user_id) == str
         assert type(password) == str
 
+        started_at = time.monotonic()
+
+        # Step 0: 저장된 세션이 있으면 복원 후 검증 (SESSION_STORE_DIR 설정 시)
+        store = SessionStore.from_env(password)
+        if store is not None:
+            restored = self._restore_session(store, user_id)
+            if restored is not None:
+                elapsed = time.monotonic() - started_at
+                saved = max(restored.get("login_seconds", 0) - elapsed, 0)
+                self.login_report = {"path": "restored", "elapsed": round(elapsed, 2), "saved": round(saved, 2)}
+                print(f"✓ Stored session restored ({elapsed:.2f}s, saved ~{saved:.2f}s)")
+                return True
+
         # Step 1: 초기 세션 ID 획득
         default_auth_cred = self._get_default_auth_cred()
         
@@ -73,7 +91,12 @@ class AuthController:
             # Step 6: 다른 서브도메인(ol, el)에서도 세션 초기화
             self._initialize_subdomain_sessions(logged_in_session_id)
 
-            print("✓ Login successful and session initialized")
+            elapsed = time.monotonic() - started_at
+            self.login_report = {"path": "full", "elapsed": round(elapsed, 2), "saved": 0}
+            if store is not None:
+                store.save(user_id, self._export_cookies(), self._AUTH_CRED, elapsed)
+
+            print(f"✓ Login successful and session initialized ({elapsed:.2f}s)")
             return True
         else:
             print(f"Login failed: {login_result.get('message', 'Unknown error')}")
@@ -240,18 +263,70 @@ class AuthController:
         print(f"✓ Session cookie set for .dhlottery.co.kr domain")
     
     def is_logged_in(self) -> bool:
-        """로그인 상태 확인"""
+        """
+        로그인 상태 확인 (마이페이지 1회 요청)
+
+        로그인 페이지로 리다이렉트되지 않고 로그아웃 버튼이 보이면 로그인 상태로 본다.
+        (메뉴의 "마이페이지"/"로그인" 문구는 로그인 여부와 관계없이 나타나므로 판단에 쓰지 않음)
+        """
         if not self._AUTH_CRED:
             return False
             
         headers = self.add_auth_cred_to_headers(self._REQ_HEADERS)
-        res = self.http_client.get(
-            "https://www.dhlottery.co.kr/userSsl.do?method=myPage",
-            headers=headers
-        )
+        try:
+            res = self.http_client.get(
+                "https://www.dhlottery.co.kr/userSsl.do?method=myPage",
+                headers=headers
+            )
+        except requests.RequestException as e:
+            print(f"Warning: Login state check failed: {e}")
+            return False
         
-        # 마이페이지에 접근 가능하면 로그인 상태
-        return "로그인" not in res.text or "마이페이지" in res.text
+        return "method=login" not in res.url and "로그아웃" in res.text
+
+    def _restore_session(self, store: SessionStore, user_id: str):
+        """
+        저장된 쿠키/세션 ID를 복원하고 가벼운 요청으로 유효성 확인
+
+        Returns:
+            유효하면 저장된 세션 딕셔너리, 없거나 만료되었으면 None
+        """
+        saved = store.load(user_id)
+        if not saved or not saved.get("auth_cred"):
+            return None
+
+        for cookie in saved.get("cookies", []):
+            self.http_client.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+                secure=cookie.get("secure", False),
+                expires=cookie.get("expires"),
+            )
+        self._AUTH_CRED = saved["auth_cred"]
+
+        if self.is_logged_in():
+            return saved
+
+        print("Stored session expired, falling back to full login")
+        self.http_client.session.cookies.clear()
+        self._AUTH_CRED = ""
+        store.delete(user_id)
+        return None
+
+    def _export_cookies(self) -> list:
+        return [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in self.http_client.session.cookies
+        ]
 
     def _initialize_subdomain_sessions(self, j_session_id: str) -> None:
         """
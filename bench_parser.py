@@ -0,0 +1,109 @@
+"""
+HTML 파서 마이크로 벤치마크
+
+저장된 페이지(예: GitHub Actions artifact의 game645_debug.html)에 대해
+스크래퍼가 읽는 노드를 백엔드별로 추출하고, 기존 방식(html5lib 전체 파싱)과
+결과가 같은지 확인한 뒤 평균 소요 시간을 출력한다.
+
+사용법:
+    python3 bench_parser.py game645_debug.html main.html mypage.html [-n 20]
+"""
+
+import argparse
+import time
+
+from bs4 import SoupStrainer
+
+from html_parser import BACKENDS, make_soup, table_body
+
+# 스크래퍼별 (이름, SoupStrainer, 추출 함수)
+TARGETS = [
+    (
+        "lottoDrwNo",
+        SoupStrainer("strong", id="lottoDrwNo"),
+        lambda soup: soup.find("strong", id="lottoDrwNo").text,
+    ),
+    (
+        "drwNo720",
+        SoupStrainer("strong", id="drwNo720"),
+        lambda soup: soup.find("strong", id="drwNo720").text,
+    ),
+    (
+        "requirements",
+        SoupStrainer("input"),
+        lambda soup: (
+            soup.find("input", id="ROUND_DRAW_DATE").get("value"),
+            soup.find("input", id="WAMT_PAY_TLMT_END_DT").get("value"),
+        ),
+    ),
+    (
+        "balance",
+        SoupStrainer("p", class_="total_new"),
+        lambda soup: soup.find("p", class_="total_new").find("strong").text,
+    ),
+    (
+        "buy_list",
+        SoupStrainer("table", class_="tbl_data tbl_data_col"),
+        lambda soup: [td.text.strip() for td in table_body(soup.find("table", class_="tbl_data tbl_data_col")).find_all("td")],
+    ),
+    (
+        "lotto645_detail",
+        SoupStrainer("div", class_="selected"),
+        lambda soup: [li.get_text(" ", strip=True) for li in soup.select("div.selected li")],
+    ),
+]
+
+
+def _extract(extract, html: str, strainer, backend: str):
+    try:
+        return extract(make_soup(html, strainer, backend=backend))
+    except (AttributeError, IndexError):
+        return None
+
+
+def _time(fn, iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started_at) / iterations * 1000
+
+
+def bench_page(path: str, iterations: int) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    print(f"\n📄 {path} ({len(html)} bytes)")
+
+    for name, strainer, extract in TARGETS:
+        reference = _extract(extract, html, None, "html5lib")
+        if reference is None:
+            continue
+
+        print(f"  [{name}] html5lib(full) 기준값: {str(reference)[:60]}")
+        baseline = _time(lambda: _extract(extract, html, None, "html5lib"), iterations)
+        print(f"    {'html5lib (full)':<22} {baseline:8.2f} ms")
+
+        for backend in BACKENDS:
+            try:
+                value = _extract(extract, html, strainer, backend)
+            except Exception as e:
+                print(f"    {backend + ' (targeted)':<22} 사용 불가: {e}")
+                continue
+
+            elapsed = _time(lambda: _extract(extract, html, strainer, backend), iterations)
+            same = "✓ 동일" if value == reference else "❌ 불일치"
+            print(f"    {backend + ' (targeted)':<22} {elapsed:8.2f} ms  x{baseline / elapsed:5.1f}  {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML parser micro-benchmark")
+    parser.add_argument("pages", nargs="*", default=["game645_debug.html"])
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    for path in args.pages:
+        bench_page(path, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+경량 브라우징 프로필 및 페이지 이동 지표
+
+구매 흐름에는 dhlottery 페이지의 DOM과 스크립트만 필요하므로, lean 프로필은
+이미지/폰트/미디어와 외부 분석·광고 스크립트를 차단하고 eager 로드 전략을 사용한다.
+CSS는 팝업 표시 여부(is_displayed) 판단에 쓰이므로 차단하지 않는다.
+
+환경변수:
+    BROWSER_PROFILE: lean(기본값) 또는 full(기존 동작)
+    BROWSER_BLOCK: 추가로 차단할 URL 패턴 (쉼표 구분, Network.setBlockedURLs 와일드카드)
+                   허용 호스트의 문서/스크립트/스타일/요청에 걸리는 패턴은 경고 후 제외
+                   (제3자 스크립트는 "*example.com*"처럼 호스트를 지정)
+    BROWSER_ALLOW: 차단하지 않을 호스트 (쉼표 구분, 기본 허용 목록에 추가)
+"""
+
+import os
+import re
+import weakref
+
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+
+from selenium_waits import get_waiter
+
+BLOCKED_URL_PATTERNS = [
+    # 이미지
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    # 폰트
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # 미디어
+    "*.mp4", "*.webm", "*.mp3",
+    # 분석/광고/배너 스크립트
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*connect.facebook.net*",
+    "*wcs.naver.net*",
+    "*beusable.net*",
+    "*criteo.*",
+]
+
+# 구매 흐름에 필요한 문서/스크립트/스타일/XHR을 제공하는 호스트
+# Network.setBlockedURLs는 예외를 표현할 수 없으므로, 이 호스트들의 필수 리소스 URL에
+# 하나라도 걸리는 차단 패턴은 목록에서 제외한다. (예: BROWSER_BLOCK의 "*.js")
+ALLOWED_HOSTS = [
+    "dhlottery.co.kr",
+    "www.dhlottery.co.kr",
+    "ol.dhlottery.co.kr",
+    "el.dhlottery.co.kr",
+    "code.jquery.com",
+]
+
+# 허용 호스트마다 차단되면 안 되는 대표 경로 (문서, 스크립트, 스타일, .do/.jsp 요청)
+_ESSENTIAL_PATHS = [
+    "/",
+    "/olotto/game/game645.do",
+    "/olotto/game/execBuy.do?x=1",
+    "/user.do?method=login",
+    "/js/common.js",
+    "/js/common.js?v=1",
+    "/jquery-3.6.0.min.js",
+    "/css/common.css",
+    "/css/common.css?v=1",
+    "/page.jsp",
+    "/data.json",
+]
+
+_LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+
+# 현재 문서의 전송 바이트(navigation + resource transferSize)와 로드 시간
+# 교차 출처 리소스는 Timing-Allow-Origin이 없으면 transferSize가 0으로 집계된다
+_NAVIGATION_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    resources: resources.length,
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+    load_ms: nav && nav.loadEventEnd ? Math.round(nav.loadEventEnd - nav.startTime) : null
+};
+"""
+
+
+def is_lean() -> bool:
+    return os.getenv("BROWSER_PROFILE", "lean").lower() == "lean"
+
+
+def _split_env(name: str) -> list:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def _pattern_regex(pattern: str):
+    """setBlockedURLs 와일드카드 패턴('*'만 특수 문자)을 정규식으로 변환"""
+    return re.compile("^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$", re.IGNORECASE)
+
+
+def _essential_urls(hosts: list) -> list:
+    return [
+        f"{scheme}://{host}{path}"
+        for host in hosts
+        for scheme in ("https", "http")
+        for path in _ESSENTIAL_PATHS
+    ]
+
+
+def build_blocked_urls() -> list:
+    """허용 호스트의 필수 리소스 URL에 걸리지 않는 차단 URL 패턴 목록"""
+    allowed_hosts = ALLOWED_HOSTS + _split_env("BROWSER_ALLOW")
+    essential_urls = _essential_urls(allowed_hosts)
+    patterns = BLOCKED_URL_PATTERNS + _split_env("BROWSER_BLOCK")
+
+    blocked = []
+    for pattern in patterns:
+        regex = _pattern_regex(pattern)
+        protected = next((url for url in essential_urls if regex.match(url)), None)
+        if protected:
+            print(f"⚠️ 차단 패턴 제외: {pattern} (구매 흐름에 필요한 {protected} 차단)")
+            continue
+        blocked.append(pattern)
+    return blocked
+
+
+def apply_options(options) -> None:
+    """
+    lean 프로필의 Chrome 옵션 적용 (드라이버 생성 전)
+
+    Args:
+        options: selenium.webdriver.chrome.options.Options
+    """
+    if not is_lean():
+        return
+
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", dict(_LEAN_PREFS))
+
+
+def apply_network_rules(driver) -> None:
+    """lean 프로필의 CDP 차단 규칙 적용 (드라이버 생성 후)"""
+    if not is_lean():
+        return
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": build_blocked_urls()})
+    except Exception as e:
+        print(f"⚠️ 리소스 차단 규칙 적용 실패: {e}")
+
+
+_navigation_logs = weakref.WeakKeyDictionary()
+
+
+def navigate(driver, url: str, label: str) -> dict:
+    """
+    페이지 이동 후 전송 바이트와 로드 시간 기록
+
+    Returns:
+        {"label", "url", "bytes", "resources", "dom_content_loaded_ms", "load_ms"}
+    """
+    driver.get(url)
+    return record_navigation(driver, label)
+
+
+def _load_complete(driver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def record_navigation(driver, label: str, timeout: float = 10) -> dict:
+    """
+    현재 문서의 전송 바이트와 로드 시간 기록 (클릭으로 이동한 페이지용)
+
+    eager 전략에서는 driver.get이 DOMContentLoaded 시점에 반환되어 이후 리소스가 집계되지
+    않으므로, load 이벤트(readyState complete) 또는 alert까지 최대 timeout초 기다린 뒤 측정한다.
+    """
+    metrics = {"label": label, "url": driver.current_url}
+    get_waiter(driver).optional(
+        EC.any_of(EC.alert_is_present(), _load_complete),
+        timeout,
+        f"{label}_load_complete",
+    )
+    try:
+        # alert가 떠 있을 때 스크립트를 실행하면 드라이버가 alert를 닫아버리므로 측정 생략
+        driver.switch_to.alert
+    except NoAlertPresentException:
+        try:
+            metrics.update(driver.execute_script(_NAVIGATION_METRICS_SCRIPT) or {})
+        except WebDriverException:
+            pass
+
+    _navigation_logs.setdefault(driver, []).append(metrics)
+    return metrics
+
+
+def navigation_summary(driver) -> list:
+    return list(_navigation_logs.get(driver, []))
+
+
+def print_navigation_summary(driver) -> None:
+    log = navigation_summary(driver)
+    if not log:
+        return
+
+    profile = "lean" if is_lean() else "full"
+    total_bytes = sum(m.get("bytes") or 0 for m in log)
+    print(f"🌐 페이지 이동 요약 ({profile}): {len(log)}회, 총 {total_bytes / 1024:.1f}KB")
+    for m in log:
+        print(
+            f"   {m['label']}: {(m.get('bytes') or 0) / 1024:.1f}KB, "
+            f"리소스 {m.get('resources', '-')}개, DOMContentLoaded {m.get('dom_content_loaded_ms', '-')}ms, "
+            f"load {m.get('load_ms') if m.get('load_ms') is not None else '-'}ms"
+        )
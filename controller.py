@@ -1,40 +1,142 @@
+import hashlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+import accounts
 import auth
+import digest
 import lotto645
 # import win720  # 연금복권 사용 안 함
 import notification
+import number_provider
+import sales_window
 import time
+from HttpClient import HttpClientPool
 
 
-def buy_lotto645(authCtrl: auth.AuthController, cnt: int, mode: str):
-    lotto = lotto645.Lotto645()
+def buy_lotto645(authCtrl: auth.AuthController, cnt: int, mode: str, games: list = None):
+    lotto = lotto645.Lotto645(authCtrl.http_client)
     _mode = lotto645.Lotto645Mode[mode.upper()]
-    response = lotto.buy_lotto645(authCtrl, cnt, _mode)
-    response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+    response = lotto.buy_lotto645(authCtrl, cnt, _mode, games)
+
+    # 잔액 조회는 구매(execBuy.do) 이후 단계이므로 실패해도 구매 결과를 실패로 바꾸지 않음
+    # (구매 실패로 알리면 수동 재시도로 중복 구매가 생길 수 있음)
+    try:
+        response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+    except Exception as e:
+        print(f"⚠️ 잔액 조회 실패: {type(e).__name__}: {e}")
+        response['balance'] = None
     return response
 
+def run_http_buy(user_id: str, password: str, count: int = 1, sheet_api_url: str = None, mode: str = "auto") -> dict:
+    """
+    requests 기반 구매 실행 (브라우저 없이 execBuy.do 직접 호출)
+
+    Returns:
+        run_selenium_buy와 같은 형식의 결과 딕셔너리
+        {"success": bool, "message": str, "games": list, "rounds": list, "buy_round": str, "balance": str}
+    """
+    result = {"success": False, "message": "", "games": [], "rounds": []}
+
+    games = None
+    if mode == "manual":
+        if not number_provider.is_configured(sheet_api_url):
+            result["message"] = "수동 모드에는 SHEET_API_URL, NUMBERS_FILE 또는 MANUAL_NUMBERS가 필요합니다"
+            return result
+
+        # HTTP 경로는 Selenium을 불러오지 않도록 number_provider를 직접 사용
+        try:
+            games = number_provider.get_numbers(count, sheet_api_url=sheet_api_url)
+        except Exception as e:
+            print(f"❌ 번호 조회 실패: {e}")
+            games = []
+        if not games:
+            result["message"] = "수동 번호를 가져올 수 없습니다"
+            return result
+        count = len(games)
+
+    max_games = lotto645.Lotto645.MAX_WEEKLY_GAMES
+    if not 1 <= count <= max_games:
+        result["message"] = f"HTTP 구매는 1-{max_games}게임만 지원합니다 (요청: {count}게임)"
+        return result
+
+    try:
+        authCtrl = auth.AuthController(HttpClientPool.get(user_id))
+        if not authCtrl.login(user_id, password):
+            result["message"] = "로그인 실패"
+            return result
+
+        response = buy_lotto645(authCtrl, count, mode, games)
+    except Exception as e:
+        print(f"❌ 예외 발생: {e}")
+        result["message"] = str(e)
+        return result
+
+    buy_result = response.get("result", {})
+    purchased = lotto645.Lotto645.parse_game_choice_nums(buy_result.get("arrGameChoiceNum"))
+
+    # 일부 배치만 성공하면 성공으로 보지 않고 요청/구매 게임 수를 함께 남김
+    result["status"] = response.get("status", "failed")
+    result["success"] = result["status"] == "success"
+    result["requested"] = count
+    result["count"] = len(purchased)
+    if result["status"] == "success":
+        result["message"] = f"{len(purchased)}게임 구매 완료"
+    elif result["status"] == "partial":
+        result["message"] = f"일부 구매: {len(purchased)}/{count}게임 ({buy_result.get('failedMsg') or '일부 배치 실패'})"
+    else:
+        result["message"] = buy_result.get("resultMsg", "구매 실패")
+    result["games"] = [{"game": g["game"], "numbers": g["numbers"]} for g in purchased]
+
+    # execBuy.do 배치(5게임 단위)를 Selenium 결과의 라운드와 같은 형식으로 기록
+    result["rounds"] = []
+    for index, batch in enumerate(response.get("batches", [buy_result]), start=1):
+        batch_games = lotto645.Lotto645.parse_game_choice_nums(batch.get("arrGameChoiceNum"))
+        result["rounds"].append({
+            "round": index,
+            "success": batch.get("resultMsg", "FAILURE").upper() == "SUCCESS",
+            "games": [{"game": g["game"], "numbers": g["numbers"]} for g in batch_games],
+        })
+    result["buy_round"] = buy_result.get("buyRound")
+    result["balance"] = response.get("balance")
+    return result
+
+def _run_buy(backend: str, user_id: str, password: str, count: int, sheet_api_url: str, mode: str, screenshot_prefix: str = "") -> dict:
+    """BUY_BACKEND(selenium|http)에 따라 구매 실행"""
+    if backend == "http":
+        return run_http_buy(user_id=user_id, password=password, count=count, sheet_api_url=sheet_api_url, mode=mode)
+
+    from selenium_lotto import run_selenium_buy
+    return run_selenium_buy(
+        user_id=user_id,
+        password=password,
+        count=count,
+        sheet_api_url=sheet_api_url,
+        mode=mode,
+        screenshot_prefix=screenshot_prefix
+    )
+
 def check_winning_lotto645(authCtrl: auth.AuthController) -> dict:
-    lotto = lotto645.Lotto645()
+    lotto = lotto645.Lotto645(authCtrl.http_client)
     item = lotto.check_winning(authCtrl)
     return item
 
 # 연금복권 관련 함수 - 사용 안 함
 # def buy_win720(authCtrl: auth.AuthController, username: str):
-#     pension = win720.Win720()
+#     pension = win720.Win720(authCtrl.http_client)
 #     response = pension.buy_Win720(authCtrl, username)
 #     response['balance'] = pension.get_balance(auth_ctrl=authCtrl)
 #     return response
 
 # def check_winning_win720(authCtrl: auth.AuthController) -> dict:
-#     pension = win720.Win720()
+#     pension = win720.Win720(authCtrl.http_client)
 #     item = pension.check_winning(authCtrl)
 #     return item
 
 def send_message(mode: int, lottery_type: int, response: dict, webhook_url: str, platform: str = "slack"):
-    notify = notification.Notification()
+    notify = notification.Notification(notification.load_targets(webhook_url, platform))
 
     if mode == 0:
         if lottery_type == 0:
@@ -47,6 +149,36 @@ def send_message(mode: int, lottery_type: int, response: dict, webhook_url: str,
         else:
             notify.send_win720_buying_message(response, webhook_url, platform)
 
+def _check_for_account(account: dict) -> tuple:
+    """단일 계정 당첨 확인 (워커 스레드에서 호출), 실패 시 {"error": 사유}"""
+    try:
+        authCtrl = auth.AuthController(HttpClientPool.get(account["username"]))
+        if not authCtrl.login(account["username"], account["password"]):
+            print(f"❌ [{account['username']}] 당첨 확인 실패: 로그인 실패")
+            return account["username"], {"error": "로그인 실패"}
+        return account["username"], check_winning_lotto645(authCtrl)
+    except Exception as e:
+        print(f"❌ [{account['username']}] 당첨 확인 실패: {e}")
+        return account["username"], {"error": f"{type(e).__name__}: {e}"}
+
+def _print_pool_stats():
+    """다중 계정 실행 후 계정별 HTTP 커넥션 재사용 통계 출력"""
+    for key, stats in HttpClientPool.stats().items():
+        if stats["requests"]:
+            print(f"HTTP 커넥션 [{key}]: 요청 {stats['requests']}건, 신규 {stats['opened']}건, 재사용 {stats['reused']}건")
+
+def check_multi(account_list: list, max_workers: int = 4) -> list:
+    """
+    여러 계정 당첨 확인을 동시에 실행
+
+    Returns:
+        [(username, winning), ...] (account_list 순서 유지)
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(account_list)))) as executor:
+        winnings = list(executor.map(_check_for_account, account_list))
+    _print_pool_stats()
+    return winnings
+
 def check():
     load_dotenv()
 
@@ -59,10 +191,20 @@ def check():
     webhook_url = slack_webhook_url or discord_webhook_url
     platform = "slack" if slack_webhook_url else "discord"
 
-    globalAuthCtrl = auth.AuthController()
+    # 다중 계정 매니페스트가 있으면 계정별 결과를 요약 메시지로 묶어 전송
+    account_list = accounts.load_accounts()
+    if account_list:
+        winnings = check_multi(account_list, max_workers=int(os.environ.get('MAX_WORKERS', '4')))
+        notify = notification.Notification(notification.load_targets(webhook_url, platform))
+        notify.send_digest(digest.Digest.for_check(winnings), webhook_url, platform)
+        return winnings
+
+    globalAuthCtrl = auth.AuthController(HttpClientPool.get(username))
     globalAuthCtrl.login(username, password)
     
     response = check_winning_lotto645(globalAuthCtrl)
+    stats = globalAuthCtrl.http_client.stats()
+    print(f"HTTP 커넥션: 요청 {stats['requests']}건, 신규 {stats['opened']}건, 재사용 {stats['reused']}건")
     send_message(0, 0, response=response, webhook_url=webhook_url, platform=platform)
 
     # 연금복권 당첨 확인 - 사용 안 함
@@ -70,6 +212,99 @@ def check():
     # response = check_winning_win720(globalAuthCtrl)
     # send_message(0, 1, response=response, webhook_url=webhook_url, platform=platform)
 
+def _buy_for_account(account: dict, sheet_api_url: str, backend: str = "selenium") -> dict:
+    """
+    단일 계정 구매 실행 (워커 스레드에서 호출)
+
+    Args:
+        account: {"username", "password", "count", "mode"}
+        sheet_api_url: 스프레드시트 API URL (수동 모드에서만 사용)
+        backend: "selenium" 또는 "http"
+
+    Returns:
+        구매 결과에 "account", "elapsed" 필드를 추가한 딕셔너리
+    """
+    started_at = time.monotonic()
+    try:
+        result = _run_buy(
+            backend,
+            user_id=account["username"],
+            password=account["password"],
+            count=account["count"],
+            sheet_api_url=sheet_api_url if account["mode"] == "manual" else None,
+            mode=account["mode"],
+            # 동시에 실행되는 계정끼리 스크린샷 파일명이 겹치지 않도록 계정별 접두어 사용
+            screenshot_prefix=hashlib.sha256(account["username"].encode("utf-8")).hexdigest()[:8]
+        )
+    except Exception as e:
+        result = {"success": False, "message": str(e), "games": [], "rounds": []}
+
+    result["account"] = account["username"]
+    result["elapsed"] = round(time.monotonic() - started_at, 2)
+    return result
+
+def buy_multi(account_list: list, sheet_api_url: str = "", max_workers: int = 4, backend: str = "selenium") -> list:
+    """
+    여러 계정을 제한된 워커 풀에서 동시에 구매
+
+    전체 소요 시간은 계정 수의 합이 아니라 가장 느린 계정(워커 수 이내)에 비례한다.
+
+    Args:
+        account_list: accounts.load_accounts() 결과
+        sheet_api_url: 스프레드시트 API URL (수동 모드 계정에서 사용)
+        max_workers: 동시에 실행할 최대 계정 수
+        backend: "selenium" 또는 "http"
+
+    Returns:
+        계정별 결과 리스트 (account_list 순서 유지)
+    """
+    if not account_list:
+        return []
+
+    workers = max(1, min(max_workers, len(account_list)))
+    print(f"👥 다중 계정 구매 시작: {len(account_list)}개 계정, 워커 {workers}개")
+
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="buy") as executor:
+        results = list(executor.map(lambda account: _buy_for_account(account, sheet_api_url, backend), account_list))
+
+    succeeded = sum(1 for r in results if r.get("success"))
+    print(f"👥 다중 계정 구매 완료: 성공 {succeeded}/{len(results)}, 소요 {time.monotonic() - started_at:.1f}초")
+    _print_pool_stats()
+    return results
+
+def _check_sales_window() -> dict:
+    """
+    판매 시간 확인 (브라우저/HTTP 세션 시작 전)
+
+    판매 시간 외이면 SALES_WAIT_MINUTES(기본값 0) 이내에 판매가 재개될 때만 기다리고,
+    그보다 멀면 "closed" 상태의 결과를 반환한다. 판매 중이면 None.
+    """
+    if os.environ.get('SALES_WINDOW_CHECK', 'true').lower() == 'false':
+        return None
+
+    window = sales_window.status()
+    if window["open"]:
+        return None
+
+    opens_at = window["opens_at"]
+    wait_seconds = (opens_at - sales_window.now_kst()).total_seconds()
+    max_wait = float(os.environ.get('SALES_WAIT_MINUTES', '0')) * 60
+
+    if wait_seconds <= max_wait:
+        print(f"⏳ 판매 시간 외 ({window['reason']}), {opens_at:%m-%d %H:%M} 판매 재개까지 {wait_seconds / 60:.1f}분 대기")
+        time.sleep(max(wait_seconds, 0))
+        return None
+
+    return {
+        "success": False,
+        "status": "closed",
+        "reason": window["reason"],
+        "opens_at": opens_at.isoformat(),
+        "message": f"판매 시간이 아닙니다 ({window['reason']}), 판매 재개: {opens_at:%Y-%m-%d %H:%M} KST",
+        "games": [],
+    }
+
 def buy(): 
     
     load_dotenv() 
@@ -83,15 +318,36 @@ def buy():
     # 구매 모드: auto 또는 manual
     purchase_mode = os.environ.get('PURCHASE_MODE', 'auto').lower()
     sheet_api_url = os.environ.get('SHEET_API_URL', '')
+
+    # 구매 방식: selenium(브라우저) 또는 http(requests로 execBuy.do 직접 호출)
+    backend = os.environ.get('BUY_BACKEND', 'selenium').lower()
     
     # Slack 우선, 없으면 Discord 사용
     webhook_url = slack_webhook_url or discord_webhook_url
     platform = "slack" if slack_webhook_url else "discord"
 
-    # Selenium 브라우저 자동화 모드 사용
-    from selenium_lotto import run_selenium_buy
-    
-    result = run_selenium_buy(
+    # NOTIFY_TARGETS가 있으면 모든 대상에 동시 전송 (없으면 위 단일 웹훅)
+    notify = notification.Notification(notification.load_targets(webhook_url, platform))
+
+    # 판매 시간 외에는 Chrome/로그인 없이 바로 종료
+    closed = _check_sales_window()
+    if closed:
+        print(f"⏸️ 구매 생략: {closed['message']}")
+        notify.send_selenium_buy_message(closed, webhook_url, platform)
+        return closed
+
+    # 다중 계정 매니페스트가 있으면 워커 풀로 동시 구매
+    account_list = accounts.load_accounts(default_count=count, default_mode=purchase_mode)
+    if account_list:
+        max_workers = int(os.environ.get('MAX_WORKERS', '4'))
+        results = buy_multi(account_list, sheet_api_url=sheet_api_url, max_workers=max_workers, backend=backend)
+
+        # 계정별 메시지 대신 요약 표로 묶어 웹훅 호출 수를 최소화
+        notify.send_digest(digest.Digest.for_buy(results), webhook_url, platform)
+        return results
+
+    result = _run_buy(
+        backend,
         user_id=username,
         password=password,
         count=count,
@@ -102,14 +358,13 @@ def buy():
     
     # 결과 출력
     if result["success"]:
-        print(f"✓ Selenium 실행 성공: {result['message']}")
+        print(f"✓ 구매 실행 성공 ({backend}): {result['message']}")
         if result.get("games"):
             print(f"   선택된 게임: {len(result['games'])}개")
     else:
-        print(f"❌ Selenium 실행 실패: {result['message']}")
+        print(f"❌ 구매 실행 실패 ({backend}): {result['message']}")
         
     # 알림 전송
-    notify = notification.Notification()
     notify.send_selenium_buy_message(result, webhook_url, platform)
 
 def run():
@@ -0,0 +1,179 @@
+"""
+다중 계정 결과 요약 메시지
+
+계정별 구매/당첨 확인 결과를 모아 고정폭 표 하나로 만들고, 플랫폼 메시지 길이 제한에 맞춰
+최소한의 메시지로 나눈다. (이어지는 메시지에는 표 머리글을 다시 붙인다)
+"""
+
+import unicodedata
+
+# 플랫폼별 메시지 최대 길이 (Discord content 2000자, Slack text는 4000자 이후 잘림)
+PLATFORM_LIMITS = {
+    "slack": 4000,
+    "discord": 2000,
+}
+
+BUY_COLUMNS = ("계정", "결과", "게임", "회차", "비고")
+CHECK_COLUMNS = ("계정", "회차", "게임", "최고", "당첨금")
+
+
+def _display_width(text: str) -> int:
+    """고정폭 글꼴 기준 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1 for ch in text)
+
+
+def _pad(text: str, width: int) -> str:
+    return text + " " * (width - _display_width(text))
+
+
+def _truncate(text: str, width: int) -> str:
+    if _display_width(text) <= width:
+        return text
+    while _display_width(text + "…") > width:
+        text = text[:-1]
+    return text + "…"
+
+
+class Digest:
+    def __init__(self, title: str, columns: tuple, note_width: int = 24):
+        self.title = title
+        self.columns = columns
+        self.note_width = note_width
+        self.rows = []
+
+    @classmethod
+    def for_buy(cls, results: list = None) -> "Digest":
+        digest = cls("🎰 로또 구매 결과", BUY_COLUMNS)
+        for result in results or []:
+            digest.add_buy(result)
+        return digest
+
+    @classmethod
+    def for_check(cls, winnings: list = None) -> "Digest":
+        """winnings: [(account, winning), ...]"""
+        digest = cls("🔍 로또 당첨 확인", CHECK_COLUMNS)
+        for account, winning in winnings or []:
+            digest.add_check(account, winning)
+        return digest
+
+    def add_buy(self, result: dict) -> None:
+        """run_selenium_buy/run_http_buy 결과 (account 키 포함) 추가"""
+        if result.get("success"):
+            status = "✅"
+            note = f"{result['elapsed']}초" if result.get("elapsed") is not None else ""
+        elif result.get("status") == "closed":
+            status = "⏸️"
+            note = result.get("message", "")
+        elif result.get("status") == "partial":
+            status = "⚠️"
+            note = result.get("message", "")
+        else:
+            status = "❌"
+            note = result.get("message", "")
+
+        games = result.get("count", len(result.get("games", []))) if result.get("success") else result.get("count", 0)
+        if result.get("requested") and games != result["requested"]:
+            games = f"{games}/{result['requested']}"
+        self.rows.append({
+            "account": result.get("account", ""),
+            "cells": (
+                result.get("account", "-"),
+                status,
+                str(games),
+                str(result.get("buy_round") or "-"),
+                _truncate(note, self.note_width),
+            ),
+        })
+
+    def add_check(self, account: str, winning: dict) -> None:
+        """
+        Lotto645.check_winning 결과 추가 (여러 티켓이면 게임 수와 최고 등수를 합산)
+
+        winning에 "error"가 있으면(로그인 실패 등) 내역 없음과 구분해 실패 행으로 표시한다.
+        """
+        if winning.get("error"):
+            self.rows.append({
+                "account": account,
+                "cells": (account, "-", "-", "-", _truncate(f"❌ {winning['error']}", self.note_width)),
+            })
+            return
+
+        tickets = winning.get("tickets")
+        if tickets is None:
+            tickets = [winning] if "round" in winning else []
+
+        details = [detail for ticket in tickets for detail in ticket.get("lotto_details", [])]
+        ranks = [
+            int(detail["status"].rstrip("등"))
+            for detail in details
+            if detail.get("status", "").rstrip("등").isdigit()
+        ]
+        best = min((rank for rank in ranks if rank > 0), default=0)
+
+        rounds = sorted({str(ticket.get("round", "-")) for ticket in tickets})
+        money = [ticket.get("money", "-") for ticket in tickets if ticket.get("money", "-") != "-"]
+        # 구매 내역 페이지 조회 오류가 있으면 티켓이 없어도 "내역 없음"이 아닌 실패로 표시
+        if winning.get("errors") and not tickets:
+            note = "❌ 내역 조회 실패"
+        elif not tickets:
+            note = "내역 없음"
+        elif any(ticket.get("error") for ticket in tickets) or winning.get("errors"):
+            note = ", ".join(money) + " (일부 조회 실패)" if money else "일부 조회 실패"
+        else:
+            note = ", ".join(money) if money else "-"
+
+        self.rows.append({
+            "account": account,
+            "cells": (
+                account,
+                ",".join(rounds) if rounds else "-",
+                str(len(details)),
+                f"{best}등" if best else "-",
+                _truncate(note, self.note_width),
+            ),
+        })
+
+    def subset(self, accounts: list = None) -> "Digest":
+        """지정한 계정의 행만 담은 Digest (accounts가 없으면 전체)"""
+        digest = Digest(self.title, self.columns, self.note_width)
+        digest.rows = [row for row in self.rows if not accounts or row["account"] in accounts]
+        return digest
+
+    def _table_lines(self) -> tuple:
+        widths = [_display_width(column) for column in self.columns]
+        for row in self.rows:
+            widths = [max(width, _display_width(cell)) for width, cell in zip(widths, row["cells"])]
+
+        def line(cells):
+            return " | ".join(_pad(cell, width) for cell, width in zip(cells, widths)).rstrip()
+
+        header = [line(self.columns), "-+-".join("-" * width for width in widths)]
+        return header, [line(row["cells"]) for row in self.rows]
+
+    def render(self, platform: str = "slack") -> list:
+        """
+        플랫폼 길이 제한에 맞춘 메시지 목록 (행 순서를 유지하며 메시지마다 최대한 채움)
+
+        Returns:
+            메시지 문자열 목록 (행이 없으면 빈 목록)
+        """
+        if not self.rows:
+            return []
+
+        limit = PLATFORM_LIMITS.get(platform, PLATFORM_LIMITS["discord"])
+        header, lines = self._table_lines()
+
+        messages = []
+        current = []
+
+        def build(body, index):
+            title = self.title if index == 0 else f"{self.title} (계속)"
+            return f"{title} ({len(self.rows)}개 계정)\n```\n" + "\n".join(header + body) + "\n```"
+
+        for line in lines:
+            if current and len(build(current + [line], len(messages))) > limit:
+                messages.append(build(current, len(messages)))
+                current = []
+            current.append(line)
+        messages.append(build(current, len(messages)))
+        return messages
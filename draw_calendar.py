@@ -0,0 +1,121 @@
+"""
+로또645 / 연금복권720+ 회차 및 추첨일 계산 (오프라인)
+
+두 복권 모두 매주 같은 요일에 추첨하므로 회차는 기준 회차(1회) 추첨일로부터의
+경과 주 수로 계산할 수 있다.
+
+    로또645:   1회 2002-12-07(토) 20:45 KST
+    연금720+:  1회 2020-05-07(목) 19:05 KST
+
+명절 등으로 추첨 일시가 바뀐 회차는 DRAW_OVERRIDES_FILE(JSON)로 덮어쓸 수 있다.
+    {"lotto645": {"1205": "2026-01-03T20:45"}, "win720": {}}
+"""
+
+import json
+import os
+import re
+
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+LOTTO645 = "lotto645"
+WIN720 = "win720"
+
+_EPOCHS = {
+    LOTTO645: datetime(2002, 12, 7, 20, 45, tzinfo=KST),
+    WIN720: datetime(2020, 5, 7, 19, 5, tzinfo=KST),
+}
+
+_WEEK = timedelta(days=7)
+
+_overrides_cache = None
+
+
+def _load_overrides() -> dict:
+    global _overrides_cache
+    if _overrides_cache is not None:
+        return _overrides_cache
+
+    overrides = {LOTTO645: {}, WIN720: {}}
+    path = os.environ.get("DRAW_OVERRIDES_FILE", "")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        for game, rounds in raw.items():
+            for round_no, draw_at in rounds.items():
+                parsed = datetime.fromisoformat(draw_at)
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=KST)
+                overrides.setdefault(game, {})[int(round_no)] = parsed
+
+    _overrides_cache = overrides
+    return overrides
+
+
+def now_kst() -> datetime:
+    return datetime.now(KST)
+
+
+def draw_datetime(game: str, round_no: int) -> datetime:
+    """
+    회차의 추첨 일시 (KST)
+
+    Args:
+        game: LOTTO645 또는 WIN720
+        round_no: 회차 (1부터 시작)
+    """
+    assert game in _EPOCHS
+    assert type(round_no) == int and round_no >= 1
+
+    override = _load_overrides().get(game, {}).get(round_no)
+    if override is not None:
+        return override
+    return _EPOCHS[game] + (round_no - 1) * _WEEK
+
+
+def current_round(game: str, now: datetime = None) -> int:
+    """
+    현재 판매 중인 회차 (아직 추첨되지 않은 가장 이른 회차)
+
+    Args:
+        game: LOTTO645 또는 WIN720
+        now: 기준 시각 (None이면 현재 KST, naive datetime은 KST로 간주)
+    """
+    assert game in _EPOCHS
+
+    now = now or now_kst()
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=KST)
+
+    elapsed_weeks = (now - _EPOCHS[game]) // _WEEK
+    round_no = max(int(elapsed_weeks) + 1, 1)
+
+    # 오버라이드로 추첨 일시가 앞뒤로 밀린 회차 보정
+    while round_no > 1 and draw_datetime(game, round_no - 1) > now:
+        round_no -= 1
+    while draw_datetime(game, round_no) <= now:
+        round_no += 1
+
+    return round_no
+
+
+def round_for_draw_date(game: str, draw_date: str):
+    """
+    추첨일 문자열(예: "2026/10/24", "20261024")에 해당하는 회차
+
+    Returns:
+        회차, 해당 날짜에 추첨하는 회차가 없으면 None
+    """
+    digits = re.sub(r"\D", "", draw_date or "")
+    if len(digits) != 8:
+        return None
+
+    target = datetime.strptime(digits, "%Y%m%d").date()
+    epoch_date = _EPOCHS[game].date()
+    round_no = (target - epoch_date).days // 7 + 1
+
+    for candidate in (round_no - 1, round_no, round_no + 1):
+        if candidate >= 1 and draw_datetime(game, candidate).date() == target:
+            return candidate
+    return None
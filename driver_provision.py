@@ -0,0 +1,100 @@
+"""
+ChromeDriver 경로 캐시 및 Chrome 프로필 관리
+
+ChromeDriverManager().install()은 실행마다 버전 조회(및 다운로드)를 수행하므로,
+설치된 Chrome 버전과 해석된 chromedriver 경로를 디스크에 캐시해 두고
+Chrome 버전이 바뀌지 않았으면 매니저를 건너뛴다.
+
+환경변수:
+    CHROMEDRIVER_CACHE: 캐시 파일 경로 (기본값 ~/.cache/lottery-bot/chromedriver.json)
+    CHROME_PROFILE_DIR: 설정 시 계정별 영구 user-data-dir을 이 디렉토리 아래에 생성
+    CHROME_BIN: Chrome 실행 파일 경로 (버전 확인용, 없으면 PATH에서 탐색)
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+_CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+def _cache_path() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "lottery-bot", "chromedriver.json")
+    return os.environ.get("CHROMEDRIVER_CACHE", default)
+
+
+def installed_chrome_version() -> str:
+    """설치된 Chrome 버전 (예: "120.0.6099.109"), 확인할 수 없으면 빈 문자열"""
+    candidates = [os.environ["CHROME_BIN"]] if os.environ.get("CHROME_BIN") else list(_CHROME_CANDIDATES)
+
+    for binary in candidates:
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=5
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def _load_cache() -> dict:
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(chrome_version: str, driver_path: str) -> None:
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"chrome_version": chrome_version, "driver_path": driver_path}, f)
+    except OSError as e:
+        print(f"⚠️ chromedriver 캐시 저장 실패: {e}")
+
+
+def resolve_driver_path() -> tuple:
+    """
+    chromedriver 경로 해석
+
+    Returns:
+        (driver_path, source) - source는 "cache" 또는 "manager"
+    """
+    chrome_version = installed_chrome_version()
+    cached = _load_cache()
+
+    if (
+        chrome_version
+        and cached.get("chrome_version") == chrome_version
+        and os.access(cached.get("driver_path", ""), os.X_OK)
+    ):
+        return cached["driver_path"], "cache"
+
+    driver_path = ChromeDriverManager().install()
+    if chrome_version:
+        _save_cache(chrome_version, driver_path)
+    return driver_path, "manager"
+
+
+def profile_dir_for(user_id: str):
+    """
+    계정별 영구 Chrome 프로필 경로 (CHROME_PROFILE_DIR 미설정 시 None)
+
+    동시에 실행되는 계정끼리 같은 프로필을 잠그지 않도록 계정마다 디렉토리를 분리한다.
+    """
+    base_dir = os.environ.get("CHROME_PROFILE_DIR", "")
+    if not base_dir or not user_id:
+        return None
+
+    digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base_dir, f"profile_{digest}")
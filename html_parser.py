@@ -0,0 +1,65 @@
+"""
+HTML 파서 백엔드 선택 및 부분 파싱 헬퍼
+
+HTML_PARSER 환경변수로 백엔드를 지정할 수 있다 (lxml, html.parser, html5lib).
+지정하지 않으면 설치되어 있는 경우 lxml, 없으면 기존과 동일하게 html5lib을 사용한다.
+
+lxml/html.parser는 SoupStrainer를 지원하므로 필요한 노드만 트리로 만든다.
+html5lib은 SoupStrainer를 지원하지 않아 전체 문서를 파싱한다.
+"""
+
+import os
+import warnings
+
+from bs4 import BeautifulSoup as BS
+from bs4 import SoupStrainer
+
+BACKENDS = ("lxml", "html.parser", "html5lib")
+
+
+def _default_backend() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html5lib"
+
+
+def get_backend() -> str:
+    backend = os.environ.get("HTML_PARSER", "") or _default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported HTML_PARSER: {backend} (choose from {', '.join(BACKENDS)})")
+    return backend
+
+
+def make_soup(html: str, parse_only: SoupStrainer = None, backend: str = None) -> BS:
+    """
+    BeautifulSoup 객체 생성
+
+    Args:
+        html: HTML 문자열
+        parse_only: 파싱할 노드를 제한하는 SoupStrainer (None이면 전체 문서)
+        backend: 파서 백엔드 (None이면 get_backend())
+
+    Returns:
+        BeautifulSoup 객체
+    """
+    backend = backend or get_backend()
+
+    if backend == "html5lib":
+        # html5lib은 parse_only를 무시하고 경고만 출력하므로 전달하지 않음
+        return BS(html, backend)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return BS(html, backend, parse_only=parse_only)
+
+
+def table_body(table):
+    """
+    첫 번째 tbody 반환
+
+    html5lib은 tbody를 자동으로 보충하지만 lxml/html.parser는 원문 그대로 두므로,
+    tbody가 없으면 table 자체를 반환해 백엔드와 무관하게 같은 행을 얻는다.
+    """
+    return table.find("tbody") or table
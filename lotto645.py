@@ -1,13 +1,19 @@
 import datetime
 import json
+import re
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from enum import Enum
 
-from bs4 import BeautifulSoup as BS
+from bs4 import SoupStrainer
 
 import auth
-from HttpClient import HttpClientSingleton
+import draw_calendar
+import number_provider
+from html_parser import make_soup, table_body
+from HttpClient import HttpClient, HttpClientSingleton
 
 class Lotto645Mode(Enum):
     AUTO = 1
@@ -17,6 +23,11 @@ class Lotto645Mode(Enum):
 
 class Lotto645:
 
+    # execBuy.do 1회 요청의 게임 슬롯, 요청당 최대 게임 수와 주간 구매 한도
+    SLOTS = ["A", "B", "C", "D", "E"]
+    MAX_GAMES_PER_REQUEST = len(SLOTS)
+    MAX_WEEKLY_GAMES = 10
+
     _REQ_HEADERS = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
         "Connection": "keep-alive",
@@ -35,57 +46,113 @@ class Lotto645:
         "Accept-Language": "ko,en-US;q=0.9,en;q=0.8,ko-KR;q=0.7",
     }
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    def __init__(self, http_client: HttpClient = None):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
     def buy_lotto645(
         self, 
         auth_ctrl: auth.AuthController, 
         cnt: int, 
-        mode: Lotto645Mode
+        mode: Lotto645Mode,
+        games: list = None
     ) -> dict:
+        """
+        로또645 구매 (requests 기반)
+
+        Args:
+            auth_ctrl: 로그인된 AuthController
+            cnt: 구매 게임 수 (1-MAX_WEEKLY_GAMES, 5게임 단위로 나눠 execBuy.do 호출)
+            mode: Lotto645Mode.AUTO 또는 Lotto645Mode.MANUAL
+            games: 수동 모드 번호 [{"game": 1, "numbers": [1,7,15,23,35,42]}, ...]
+                   (fetch_numbers_from_sheet 결과 형식)
+        """
         assert type(auth_ctrl) == auth.AuthController
-        assert type(cnt) == int and 1 <= cnt <= 5
+        assert type(cnt) == int and 1 <= cnt <= self.MAX_WEEKLY_GAMES
         assert type(mode) == Lotto645Mode
+        assert mode != Lotto645Mode.MANUAL or (type(games) == list and len(games) == cnt)
 
         headers = self._generate_req_headers(auth_ctrl)
         requirements = self._getRequirements(headers)
 
-        data = (
-            self._generate_body_for_auto_mode(cnt, requirements)
-            if mode == Lotto645Mode.AUTO
-            else self._generate_body_for_manual(cnt)
-        )
+        # 같은 세션과 requirements로 5게임씩 나눠 구매
+        bodies = []
+        for start in range(0, cnt, self.MAX_GAMES_PER_REQUEST):
+            batch_cnt = min(self.MAX_GAMES_PER_REQUEST, cnt - start)
+            data = (
+                self._generate_body_for_auto_mode(batch_cnt, requirements)
+                if mode == Lotto645Mode.AUTO
+                else self._generate_body_for_manual(batch_cnt, requirements, games[start:start + batch_cnt])
+            )
 
-        body = self._try_buying(headers, data)
+            batch_body = self._try_buying(headers, data)
+            bodies.append(batch_body)
+
+            if not self._is_success(batch_body):
+                print(f"❌ Batch {len(bodies)} failed: {batch_body.get('result', {}).get('resultMsg')}")
+                break
+
+        body = self._merge_results(bodies, cnt)
 
         self._show_result(body)
         return body
 
+    def _is_success(self, body: dict) -> bool:
+        return body.get("result", {}).get("resultMsg", "FAILURE").upper() == "SUCCESS"
+
+    def _merge_results(self, bodies: list, requested: int = None) -> dict:
+        """
+        배치별 execBuy.do 응답을 하나로 병합
+
+        첫 배치가 실패하면 그 응답을 그대로 반환한다. 이후 배치가 실패하면 성공한 배치의
+        번호만 arrGameChoiceNum에 담고 resultMsg를 "PARTIAL"로 바꾼다. (실패한 배치의 메시지는
+        failedMsg) 배치별 결과는 "batches", 요청/구매 게임 수는 "requested"/"purchased",
+        전체 결과는 "status"(success | partial | failed)에 남긴다.
+        """
+        assert type(bodies) == list and len(bodies) > 0
+
+        successful = [body for body in bodies if self._is_success(body)]
+        failed = [body for body in bodies if not self._is_success(body)]
+        choices = [
+            choice
+            for body in successful
+            for choice in body["result"].get("arrGameChoiceNum") or []
+        ]
+
+        merged = dict(bodies[0])
+        merged["batches"] = [body.get("result", {}) for body in bodies]
+        merged["requested"] = requested if requested is not None else len(choices)
+        merged["purchased"] = len(choices)
+        if not successful:
+            merged["status"] = "failed"
+            return merged
+
+        result = dict(successful[-1].get("result", {}))
+        result["arrGameChoiceNum"] = choices
+        if failed or len(choices) < merged["requested"]:
+            merged["status"] = "partial"
+            result["resultMsg"] = "PARTIAL"
+            result["failedMsg"] = failed[0].get("result", {}).get("resultMsg") if failed else None
+        else:
+            merged["status"] = "success"
+        merged["result"] = result
+        return merged
+
     def _generate_req_headers(self, auth_ctrl: auth.AuthController) -> dict:
         assert type(auth_ctrl) == auth.AuthController
 
         return auth_ctrl.add_auth_cred_to_headers(self._REQ_HEADERS)
 
     def _generate_body_for_auto_mode(self, cnt: int, requirements: list) -> dict:
-        assert type(cnt) == int and 1 <= cnt <= 5
-
-        SLOTS = [
-            "A",
-            "B",
-            "C",
-            "D",
-            "E",
-        ]  
+        assert type(cnt) == int and 1 <= cnt <= self.MAX_GAMES_PER_REQUEST
 
         return {
-            "round": self._get_round(),
+            "round": self._get_round(requirements[1]),
             "direct": requirements[0],  # TODO: test if this can be comment
             "nBuyAmount": str(1000 * cnt),
             "param": json.dumps(
                 [
                     {"genType": "0", "arrGameChoiceNum": None, "alpabet": slot}
-                    for slot in SLOTS[:cnt]
+                    for slot in self.SLOTS[:cnt]
                 ]
             ),
             'ROUND_DRAW_DATE' : requirements[1],
@@ -93,27 +160,75 @@ class Lotto645:
             "gameCnt": cnt
         }
 
-    def _generate_body_for_manual(self, cnt: int) -> dict:
-        assert type(cnt) == int and 1 <= cnt <= 5
+    def _generate_body_for_manual(self, cnt: int, requirements: list, games: list) -> dict:
+        assert type(cnt) == int and 1 <= cnt <= self.MAX_GAMES_PER_REQUEST
+        assert type(games) == list and len(games) == cnt
+
+        params = [
+            {
+                "genType": "1",
+                "arrGameChoiceNum": ",".join(str(n) for n in sorted(game["numbers"])),
+                "alpabet": slot,
+            }
+            for slot, game in zip(self.SLOTS, number_provider.validate_games(games))
+        ]
 
-        raise NotImplementedError()
+        return {
+            "round": self._get_round(requirements[1]),
+            "direct": requirements[0],
+            "nBuyAmount": str(1000 * cnt),
+            "param": json.dumps(params),
+            'ROUND_DRAW_DATE' : requirements[1],
+            'WAMT_PAY_TLMT_END_DT' : requirements[2],
+            "gameCnt": cnt
+        }
 
     def _getRequirements(self, headers: dict) -> list: 
+        """
+        execBuy.do 본문에 필요한 값을 동시에 조회
+
+        egovUserReadySocket.json(ready_ip)과 game645.do(추첨일/지급기한)는 서로 의존하지 않으므로
+        같은 세션에서 병렬로 요청한다. 회차는 오프라인 달력으로 계산한다.
+
+        Returns:
+            [ready_ip, ROUND_DRAW_DATE, WAMT_PAY_TLMT_END_DT]
+        """
         org_headers = headers.copy()
 
         headers["Referer"] ="https://ol.dhlottery.co.kr/olotto/game/game645.do"
         headers["Content-Type"] = "application/json; charset=UTF-8"
         headers["X-Requested-With"] ="XMLHttpRequest"
 
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch") as executor:
+            ready_future = executor.submit(self._timed, self._get_ready_ip, headers.copy())
+            dates_future = executor.submit(self._timed, self._get_round_dates, org_headers)
+
+            direct, ready_elapsed = ready_future.result()
+            (draw_date, tlmt_date), dates_elapsed = dates_future.result()
 
+        self.prefetch_latencies = {
+            "egovUserReadySocket.json": round(ready_elapsed, 3),
+            "game645.do": round(dates_elapsed, 3),
+        }
+        print(f"✓ Prefetch latencies: {self.prefetch_latencies}")
+
+        return [direct, draw_date, tlmt_date]
+
+    def _timed(self, fn, *args):
+        started_at = time.monotonic()
+        value = fn(*args)
+        return value, time.monotonic() - started_at
+
+    def _get_ready_ip(self, headers: dict) -> str:
 		#no param needed at now
         res = self.http_client.post(
             url="https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json", 
             headers=headers
         )
         
-        direct = json.loads(res.text)["ready_ip"]
+        return json.loads(res.text)["ready_ip"]
 
+    def _get_round_dates(self, org_headers: dict) -> tuple:
         # game645.do 호출 (로그인 시 이미 세션 초기화됨)
         print(f"Calling game645.do...")
         res = self.http_client.get(
@@ -123,9 +238,12 @@ class Lotto645:
         html = res.text
 
         # 디버깅: HTML 파일 저장 (GitHub Actions Artifacts용)
+        # 다중 계정 실행에서 워커끼리 같은 파일을 덮어쓰지 않도록 계정 키를 파일 이름에 포함
         import os
         debug_dir = os.getenv('GITHUB_WORKSPACE', '.')
-        debug_file = os.path.join(debug_dir, 'game645_debug.html')
+        key = getattr(self.http_client, 'key', 'default')
+        suffix = '' if key == 'default' else '_' + re.sub(r'[^\w.-]', '_', key)
+        debug_file = os.path.join(debug_dir, f'game645_debug{suffix}.html')
         try:
             with open(debug_file, 'w', encoding='utf-8') as f:
                 f.write(html)
@@ -142,7 +260,7 @@ class Lotto645:
         # 디버깅: 기본 정보
         print(f"✓ game645.do response: {res.status_code}, {len(html)} bytes")
 
-        soup = BS(html, "html5lib")
+        soup = make_soup(html, SoupStrainer("input"))
 
         draw_date_input = soup.find("input", id="ROUND_DRAW_DATE")
         tlmt_date_input = soup.find("input", id="WAMT_PAY_TLMT_END_DT")
@@ -166,14 +284,34 @@ class Lotto645:
         print(f"✓ Found ROUND_DRAW_DATE: {draw_date}")
         print(f"✓ Found WAMT_PAY_TLMT_END_DT: {tlmt_date}")
 
-        return [direct, draw_date, tlmt_date]
+        return draw_date, tlmt_date
 
-    def _get_round(self) -> str:
+    def _get_round(self, draw_date: str = None) -> str:
+        """
+        구매할 회차 (오프라인 달력 계산)
+
+        Args:
+            draw_date: game645.do의 ROUND_DRAW_DATE 값. 주어지면 달력 결과를 검증한다.
+                       불일치하면 추첨일에 해당하는 회차를, 그것도 구할 수 없으면
+                       메인 페이지 스크랩 결과를 사용한다.
+        """
+        round_no = draw_calendar.current_round(draw_calendar.LOTTO645)
+        if not draw_date:
+            return str(round_no)
+
+        expected = draw_calendar.round_for_draw_date(draw_calendar.LOTTO645, draw_date)
+        if expected == round_no:
+            return str(round_no)
+
+        print(f"Warning: Round calendar mismatch (calendar={round_no}, draw date {draw_date}={expected})")
+        if expected is not None:
+            return str(expected)
+        return self._scrape_round()
+
+    def _scrape_round(self) -> str:
         res = self.http_client.get("https://www.dhlottery.co.kr/common.do?method=main")
         html = res.text
-        soup = BS(
-            html, "html5lib"
-        )  # 'html5lib' : in case that the html don't have clean tag pairs
+        soup = make_soup(html, SoupStrainer("strong", id="lottoDrwNo"))
         last_drawn_round = int(soup.find("strong", id="lottoDrwNo").text)
         return str(last_drawn_round + 1)
 
@@ -186,9 +324,7 @@ class Lotto645:
         )
 
         html = res.text
-        soup = BS(
-            html, "html5lib"
-        )
+        soup = make_soup(html, SoupStrainer("p", class_="total_new"))
         balance = soup.find("p", class_="total_new").find('strong').text
         return balance
         
@@ -206,46 +342,123 @@ class Lotto645:
         res.encoding = "utf-8"
         return json.loads(res.text)
 
-    def check_winning(self, auth_ctrl: auth.AuthController) -> dict:
+    def check_winning(self, auth_ctrl: auth.AuthController, max_pages: int = 10, max_workers: int = 4) -> dict:
+        """
+        최근 1주일 구매 내역 전체의 당첨 결과 조회
+
+        구매 내역(lottoBuyList)의 모든 페이지를 순회하고, 티켓별 상세 페이지는 공유 세션으로 동시에 조회한다.
+
+        Returns:
+            가장 최근 티켓의 {"round", "money", "purchased_date", "winning_date", "lotto_details"}에
+            "tickets"(모든 티켓, 티켓별 "error" 포함)와 "errors"(페이지 조회 오류)를 더한 딕셔너리.
+            구매 내역이 없으면 {"data": "no winning data", "tickets": [], "errors": [...]}
+        """
         assert type(auth_ctrl) == auth.AuthController
 
         headers = self._generate_req_headers(auth_ctrl)
-
         parameters = self._make_search_date()
 
-        data = {
-            "nowPage": 1, 
-            "searchStartDate": parameters["searchStartDate"],
-            "searchEndDate": parameters["searchEndDate"],
-            "winGrade": 2,
-            "lottoId": "LO40", 
-            "sortOrder": "DESC"
-        }
+        tickets, errors = self._get_buy_list(headers, parameters, max_pages)
 
-        result_data = {
-            "data": "no winning data"
-        }
+        if tickets:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickets))), thread_name_prefix="detail") as executor:
+                list(executor.map(self._fill_ticket_detail, tickets))
 
-        try:
-            res = self.http_client.post(
-                "https://dhlottery.co.kr/myPage.do?method=lottoBuyList",
-                headers=headers,
-                data=data
-            )
+        if not tickets:
+            return {"data": "no winning data", "tickets": [], "errors": errors}
 
-            html = res.text
-            soup = BS(html, "html5lib")
-
-            winnings = soup.find("table", class_="tbl_data tbl_data_col").find_all("tbody")[0].find_all("td")
+        latest = tickets[0]
+        result_data = {key: latest[key] for key in ("round", "money", "purchased_date", "winning_date", "lotto_details")}
+        result_data["tickets"] = tickets
+        result_data["errors"] = errors
+        return result_data
 
-            get_detail_info = winnings[3].find("a").get("href")
+    def _get_buy_list(self, headers: dict, parameters: dict, max_pages: int) -> tuple:
+        """
+        구매 내역 전체 페이지 조회 (빈 페이지 또는 이전과 같은 페이지가 나오면 종료,
+        max_pages에 도달하면 이후 내역이 잘렸을 수 있음을 errors에 기록)
+
+        Returns:
+            (tickets, errors)
+        """
+        tickets = []
+        errors = []
+        seen = set()
+
+        for page in range(1, max_pages + 1):
+            data = {
+                "nowPage": page, 
+                "searchStartDate": parameters["searchStartDate"],
+                "searchEndDate": parameters["searchEndDate"],
+                "winGrade": 2,
+                "lottoId": "LO40", 
+                "sortOrder": "DESC"
+            }
 
-            order_no, barcode, issue_no = get_detail_info.split("'")[1::2]
-            url = f"https://dhlottery.co.kr/myPage.do?method=lotto645Detail&orderNo={order_no}&barcode={barcode}&issueNo={issue_no}"
+            try:
+                res = self.http_client.post(
+                    "https://dhlottery.co.kr/myPage.do?method=lottoBuyList",
+                    headers=headers,
+                    data=data
+                )
+                page_tickets = self._parse_buy_list(res.text)
+            except Exception as e:
+                errors.append(f"page {page}: {type(e).__name__}: {e}")
+                break
+
+            new_tickets = [t for t in page_tickets if (t["order_no"], t["barcode"], t["issue_no"]) not in seen]
+            if not new_tickets:
+                break
+
+            for ticket in new_tickets:
+                seen.add((ticket["order_no"], ticket["barcode"], ticket["issue_no"]))
+            tickets.extend(new_tickets)
+        else:
+            errors.append(f"page {max_pages}: 최대 페이지 수({max_pages})에 도달해 이후 내역은 조회하지 않았습니다")
+
+        return tickets, errors
+
+    def _parse_buy_list(self, html: str) -> list:
+        soup = make_soup(html, SoupStrainer("table", class_="tbl_data tbl_data_col"))
+        table = soup.find("table", class_="tbl_data tbl_data_col")
+        if table is None:
+            raise ValueError("구매 내역 표를 찾을 수 없습니다")
+
+        tickets = []
+        for row in table_body(table).find_all("tr"):
+            cells = row.find_all("td")
+            # 내역이 없으면 colspan 셀 하나만 있음
+            if len(cells) < 8:
+                continue
+
+            link = cells[3].find("a")
+            if link is None:
+                continue
+
+            order_no, barcode, issue_no = link.get("href").split("'")[1::2]
+            tickets.append({
+                "round": cells[2].text.strip(),
+                "money": cells[6].text.strip(),
+                "purchased_date": cells[0].text.strip(),
+                "winning_date": cells[7].text.strip(),
+                "order_no": order_no,
+                "barcode": barcode,
+                "issue_no": issue_no,
+                "lotto_details": [],
+                "error": None,
+            })
+        return tickets
+
+    def _fill_ticket_detail(self, ticket: dict) -> None:
+        """티켓 상세 페이지의 게임별 결과를 ticket["lotto_details"]에 채움 (실패 시 ticket["error"])"""
+        url = (
+            "https://dhlottery.co.kr/myPage.do?method=lotto645Detail"
+            f"&orderNo={ticket['order_no']}&barcode={ticket['barcode']}&issueNo={ticket['issue_no']}"
+        )
 
+        try:
             response = self.http_client.get(url)
-
-            soup = BS(response.text, "html5lib")
+            soup = make_soup(response.text, SoupStrainer("div", class_="selected"))
 
             lotto_results = []
 
@@ -270,21 +483,10 @@ class Lotto645:
                     "result": formatted_nums
                 })
 
-            if len(winnings) == 1:
-                return result_data
-
-            result_data = {
-                "round": winnings[2].text.strip(),
-                "money": winnings[6].text.strip(),
-                "purchased_date": winnings[0].text.strip(),
-                "winning_date": winnings[7].text.strip(),
-                "lotto_details": lotto_results
-            }
-        except:
-            pass
+            ticket["lotto_details"] = lotto_results
+        except Exception as e:
+            ticket["error"] = f"{type(e).__name__}: {e}"
 
-        return result_data
-    
     def _make_search_date(self) -> dict:
         today = datetime.datetime.today()
         today_str = today.strftime("%Y%m%d")
@@ -295,6 +497,27 @@ class Lotto645:
             "searchEndDate": today_str
         }
 
+    @staticmethod
+    def parse_game_choice_nums(arr_game_choice_num: list) -> list:
+        """
+        execBuy.do 응답의 arrGameChoiceNum 파싱
+
+        Args:
+            arr_game_choice_num: ["A|01|07|15|23|35|423", ...] (마지막 글자는 선택 유형)
+
+        Returns:
+            [{"game": 1, "slot": "A", "numbers": [1,7,15,23,35,42]}, ...]
+        """
+        games = []
+        for index, choice in enumerate(arr_game_choice_num or [], start=1):
+            slot, *numbers = choice[:-1].split("|")
+            games.append({
+                "game": index,
+                "slot": slot,
+                "numbers": [int(n) for n in numbers],
+            })
+        return games
+
     def _show_result(self, body: dict) -> None:
         assert type(body) == dict
 
@@ -302,5 +525,5 @@ class Lotto645:
             return
 
         result = body.get("result", {})
-        if result.get("resultMsg", "FAILURE").upper() != "SUCCESS":    
+        if result.get("resultMsg", "FAILURE").upper() not in ("SUCCESS", "PARTIAL"):    
             return
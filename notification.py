@@ -1,33 +1,108 @@
-import requests
+import json
+import os
 import re
+import threading
+
+import digest
+import webhook_dispatcher
+
+PLATFORMS = ("slack", "discord")
+FORMATS = ("markdown", "plain")
+
+
+def load_targets(webhook_url: str = None, platform: str = "slack") -> list:
+    """
+    알림 대상 목록
+
+    NOTIFY_TARGETS(JSON 문자열) 또는 NOTIFY_TARGETS_FILE(JSON 파일)이 있으면 그 목록을 사용하고,
+    없으면 기존 단일 웹훅(webhook_url, platform)을 대상 하나로 사용한다.
+
+        [{"name": "family-a", "url": "https://hooks.slack.com/...", "platform": "slack",
+          "format": "markdown", "accounts": ["user1", "user2"]}, ...]
+
+    format: markdown(기본값) 또는 plain(코드 블록 표시 제거)
+    accounts: 이 대상이 받을 계정 목록 (생략 시 모든 계정, 계정이 없는 메시지는 모든 대상에 전송)
+    """
+    raw = os.environ.get("NOTIFY_TARGETS", "").strip()
+    path = os.environ.get("NOTIFY_TARGETS_FILE", "")
+    if not raw and path:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read()
+
+    if not raw:
+        if not webhook_url:
+            return []
+        return [{"name": platform, "url": webhook_url, "platform": platform, "format": "markdown", "accounts": None}]
+
+    targets = []
+    for index, item in enumerate(json.loads(raw), start=1):
+        if not item.get("url"):
+            raise ValueError(f"NOTIFY_TARGETS[{index}]: url is required")
+        target_platform = item.get("platform", "slack").lower()
+        if target_platform not in PLATFORMS:
+            raise ValueError(f"NOTIFY_TARGETS[{index}]: unknown platform {target_platform}")
+        target_format = item.get("format", "markdown").lower()
+        if target_format not in FORMATS:
+            raise ValueError(f"NOTIFY_TARGETS[{index}]: unknown format {target_format}")
+        targets.append({
+            "name": item.get("name") or f"{target_platform}-{index}",
+            "url": item["url"],
+            "platform": target_platform,
+            "format": target_format,
+            "accounts": item.get("accounts"),
+        })
+    return targets
+
 
 class Notification:
+    def __init__(self, targets: list = None):
+        """
+        Args:
+            targets: load_targets() 형식의 알림 대상 목록.
+                     지정하면 각 send_* 메서드의 webhook_url/platform 대신 모든 대상에 동시 전송한다.
+        """
+        self.targets = targets or []
+        self.deliveries = []
+        self._lock = threading.Lock()
+
     def send_lotto_buying_message(self, body: dict, webhook_url: str, platform: str = "slack") -> None:
-        assert type(webhook_url) == str
+        assert self.targets or type(webhook_url) == str
 
         result = body.get("result", {})
-        if result.get("resultMsg", "FAILURE").upper() != "SUCCESS":  
+        result_msg = result.get("resultMsg", "FAILURE").upper()
+        if result_msg not in ("SUCCESS", "PARTIAL"):  
             return
 
         lotto_number_str = self.make_lotto_number_message(result["arrGameChoiceNum"])
         message = f"{result['buyRound']}회 로또 구매 완료 :moneybag: 남은잔액 : {body['balance']}\n```{lotto_number_str}```"
+        if result_msg == "PARTIAL":
+            message = f"⚠️ 일부만 구매됨 ({body.get('purchased')}/{body.get('requested')}게임, {result.get('failedMsg')})\n{message}"
         self._send_webhook(webhook_url, message, platform)
 
     def send_selenium_buy_message(self, result: dict, webhook_url: str, platform: str = "slack") -> None:
-        """Selenium 구매 결과 알림 전송 (10게임 지원)"""
-        if result.get("success"):
-            total_games = len(result.get("games", []))
+        """Selenium 구매 결과 알림 전송 (10게임 지원, 다중 계정 결과는 계정명 표시)"""
+        account_label = f"[{result['account']}] " if result.get("account") else ""
+
+        if result.get("success") or result.get("status") == "partial":
+            total_games = result.get("count", len(result.get("games", [])))
             rounds = result.get("rounds", [])
             
-            message = f"🎰 로또 구매 완료! ({total_games}게임)\n"
+            if result.get("success"):
+                message = f"{account_label}🎰 로또 구매 완료! ({total_games}게임)\n"
+            else:
+                message = f"{account_label}⚠️ 로또 일부 구매 ({total_games}/{result.get('requested', '?')}게임)\n이유: {result.get('message')}\n"
+            if result.get("buy_round"):
+                message += f"회차: {result['buy_round']}회\n"
+            if result.get("balance"):
+                message += f"남은잔액: {result['balance']}\n"
             
             # 라운드별 결과
             if rounds:
                 for r in rounds:
                     status = "✅" if r.get("success") else "❌"
                     message += f"{status} 라운드 {r['round']}: "
-                    if r.get("games"):
-                        message += f"{len(r['games'])}게임\n"
+                    if r.get("success"):
+                        message += f"{r.get('count', len(r.get('games', [])))}게임\n"
                     else:
                         message += "실패\n"
             
@@ -37,10 +112,34 @@ class Notification:
                 for game in result["games"]:
                     message += f"게임 {game['game']}: {game['numbers']}\n"
                 message += "```"
+        elif result.get("status") == "closed":
+            message = f"{account_label}⏸️ 로또 구매 생략\n이유: {result.get('message')}"
         else:
-            message = f"❌ 로또 구매 실패\n이유: {result.get('message')}"
+            message = f"{account_label}❌ 로또 구매 실패\n이유: {result.get('message')}"
         
-        self._send_webhook(webhook_url, message, platform)
+        self._send_webhook(webhook_url, message, platform, account=result.get("account"))
+
+    def send_digest(self, digest, webhook_url: str, platform: str = "slack") -> list:
+        """
+        다중 계정 요약(digest.Digest) 전송
+
+        대상마다 해당 계정 행만 골라 플랫폼 길이 제한에 맞춘 최소 개수의 메시지로 보낸다.
+
+        Returns:
+            전송 Future 목록
+        """
+        if not self.targets:
+            return [
+                self._send_webhook(webhook_url, message, platform)
+                for message in digest.render(platform)
+                if webhook_url
+            ]
+
+        return [
+            self._deliver(target, message)
+            for target in self.targets
+            for message in digest.subset(target.get("accounts")).render(target["platform"])
+        ]
 
     def make_lotto_number_message(self, lotto_number: list) -> str:
         assert type(lotto_number) == list
@@ -76,48 +175,77 @@ class Notification:
 
     def send_lotto_winning_message(self, winning: dict, webhook_url: str, platform: str = "slack") -> None: 
         assert type(winning) == dict
-        assert type(webhook_url) == str
+        assert self.targets or type(webhook_url) == str
 
-        try: 
-            round = winning["round"]
-            money = winning["money"]
+        # 이전 형식(티켓 하나의 결과만 있는 딕셔너리)도 그대로 처리
+        tickets = winning.get("tickets")
+        if tickets is None:
+            tickets = [winning] if "round" in winning else []
 
-            max_label_status_length = max(len(f"{line['label']} {line['status']}") for line in winning["lotto_details"])
+        blocks = []
+        for ticket in tickets:
+            try:
+                block = self._make_lotto_ticket_message(ticket)
+            except (KeyError, ValueError) as e:
+                block = f"⚠️ 로또 *{ticket.get('round', '?')}회* 티켓 결과 표시 실패: {type(e).__name__}"
+            if len(tickets) > 1:
+                block = f"🎫 {ticket.get('purchased_date', '')} 구매\n{block}"
+            blocks.append(block)
+        blocks.extend(f"⚠️ 구매 내역 조회 오류: {error}" for error in winning.get("errors", []))
 
-            formatted_lines = []
-            for line in winning["lotto_details"]:
-                line_label_status = f"{line['label']} {line['status']}".ljust(max_label_status_length)
-                line_result = line["result"]
+        if not blocks:
+            return
 
-                formatted_nums = []
-                for num in line_result:
-                    raw_num = re.search(r'\d+', num).group()
-                    formatted_num = f"{int(raw_num):02d}"
-                    if '✨' in num:
-                        formatted_nums.append(f"[{formatted_num}]")
-                    else:
-                        formatted_nums.append(f" {formatted_num} ")
+        # 티켓이 많으면 플랫폼 길이 제한 안에서 최소 개수의 메시지로 묶어 전송
+        platforms = [target["platform"] for target in self.targets] or [platform]
+        limit = min(digest.PLATFORM_LIMITS.get(p, digest.PLATFORM_LIMITS["discord"]) for p in platforms)
 
-                formatted_nums = [f"{num:>6}" for num in formatted_nums]
+        message = ""
+        for block in blocks:
+            if message and len(message) + len(block) + 2 > limit:
+                self._send_webhook(webhook_url, message, platform)
+                message = ""
+            message = f"{message}\n\n{block}" if message else block
+        self._send_webhook(webhook_url, message, platform)
 
-                formatted_line = f"{line_label_status} " + " ".join(formatted_nums)
-                formatted_lines.append(formatted_line)
+    def _make_lotto_ticket_message(self, ticket: dict) -> str:
+        """티켓 하나의 게임별 결과 표와 당첨 문구 (상세 조회 실패 시 오류 문구)"""
+        if ticket.get("error"):
+            return f"⚠️ 로또 *{ticket['round']}회* 티켓 상세 조회 실패: {ticket['error']}"
 
-            formatted_results = "\n".join(formatted_lines)
+        max_label_status_length = max(len(f"{line['label']} {line['status']}") for line in ticket["lotto_details"])
 
-            if winning['money'] != "-":
-                winning_message = f"로또 *{winning['round']}회* - *{winning['money']}* 당첨 되었습니다 🎉"
-            else:
-                winning_message = f"로또 *{winning['round']}회* - 다음 기회에... 🫠"
+        formatted_lines = []
+        for line in ticket["lotto_details"]:
+            line_label_status = f"{line['label']} {line['status']}".ljust(max_label_status_length)
+            line_result = line["result"]
 
-            full_message = f"```{formatted_results}```\n{winning_message}"
-            self._send_webhook(webhook_url, full_message, platform)
-        except KeyError:
-            return
+            formatted_nums = []
+            for num in line_result:
+                raw_num = re.search(r'\d+', num).group()
+                formatted_num = f"{int(raw_num):02d}"
+                if '✨' in num:
+                    formatted_nums.append(f"[{formatted_num}]")
+                else:
+                    formatted_nums.append(f" {formatted_num} ")
+
+            formatted_nums = [f"{num:>6}" for num in formatted_nums]
+
+            formatted_line = f"{line_label_status} " + " ".join(formatted_nums)
+            formatted_lines.append(formatted_line)
+
+        formatted_results = "\n".join(formatted_lines)
+
+        if ticket['money'] != "-":
+            winning_message = f"로또 *{ticket['round']}회* - *{ticket['money']}* 당첨 되었습니다 🎉"
+        else:
+            winning_message = f"로또 *{ticket['round']}회* - 다음 기회에... 🫠"
+
+        return f"```{formatted_results}```\n{winning_message}"
 
     def send_win720_winning_message(self, winning: dict, webhook_url: str, platform: str = "slack") -> None: 
         assert type(winning) == dict
-        assert type(webhook_url) == str
+        assert self.targets or type(webhook_url) == str
 
         try: 
             round = winning["round"]
@@ -134,22 +262,62 @@ class Notification:
             self._send_webhook(webhook_url, message, platform)
             return
 
-    def _send_webhook(self, webhook_url: str, message: str, platform: str = "slack") -> None:
-        """통합 웹훅 전송 함수"""
+    def _send_webhook(self, webhook_url: str, message: str, platform: str = "slack", account: str = None):
+        """
+        통합 웹훅 전송 함수 (백그라운드 전송 예약 후 즉시 반환)
+
+        대상 목록이 있으면 account로 필터링한 모든 대상에 동시에 전송하고 Future 목록을,
+        없으면 webhook_url 하나로 전송하고 Future를 반환한다.
+        """
+        if self.targets:
+            return [
+                self._deliver(target, message, account)
+                for target in self.targets
+                if account is None or not target.get("accounts") or account in target["accounts"]
+            ]
+
         if not webhook_url:
-            return
+            return None
             
         if platform == "slack":
-            self._send_slack_webhook(webhook_url, message)
+            return self._send_slack_webhook(webhook_url, message)
         elif platform == "discord":
-            self._send_discord_webhook(webhook_url, message)
+            return self._send_discord_webhook(webhook_url, message)
+
+    def _deliver(self, target: dict, message: str, account: str = None):
+        if target["format"] == "plain":
+            message = message.replace("```", "")
+
+        if target["platform"] == "slack":
+            future = self._send_slack_webhook(target["url"], message)
+        else:
+            future = self._send_discord_webhook(target["url"], message)
+
+        record = {"target": target["name"], "platform": target["platform"], "account": account, "status": "queued"}
+        with self._lock:
+            self.deliveries.append(record)
+
+        def report(done):
+            outcome = done.result()
+            record.update(status=outcome["status"], status_code=outcome["status_code"], latency=outcome["latency"], error=outcome["error"])
+            mark = "📨" if outcome["status"] == "sent" else "⚠️"
+            detail = outcome["status_code"] if outcome["error"] is None else outcome["error"]
+            print(f"{mark} 알림 {target['name']} ({target['platform']}): {outcome['status']} {detail}, {outcome['latency']:.2f}초")
+
+        future.add_done_callback(report)
+        return future
+
+    def delivery_report(self) -> list:
+        """전송 기록 [{"target", "platform", "account", "status", "status_code", "latency", "error"}, ...]"""
+        with self._lock:
+            return [dict(record) for record in self.deliveries]
 
-    def _send_slack_webhook(self, webhook_url: str, message: str) -> None:
+    def _send_slack_webhook(self, webhook_url: str, message: str):
         """Slack 웹훅 전송"""
         payload = { "text": message }
-        requests.post(webhook_url, json=payload)
+        return webhook_dispatcher.get_dispatcher().submit(webhook_url, payload, label="slack")
 
-    def _send_discord_webhook(self, webhook_url: str, message: str) -> None:        
+    def _send_discord_webhook(self, webhook_url: str, message: str):
         """Discord 웹훅 전송"""
         payload = { "content": message }
-        requests.post(webhook_url, json=payload)
+        return webhook_dispatcher.get_dispatcher().submit(webhook_url, payload, label="discord")
@@ -0,0 +1,238 @@
+"""
+수동 모드 번호 공급
+
+번호 출처 (앞선 출처가 있으면 그것을 사용):
+    1. MANUAL_NUMBERS 환경변수: "1,7,15,23,35,42;3,9,..." 또는 JSON ([[1,7,...], ...])
+    2. NUMBERS_FILE: 로컬 JSON 또는 CSV (한 줄에 한 게임)
+    3. Apps Script Web App (SHEET_API_URL)
+
+Apps Script는 구매 직전에 항상 동기로 조회한다. (시트를 고친 직후 실행되는 수동 구매가
+이전 번호를 사지 않도록) 응답은 추첨 회차별로 로컬에 저장해 두고, 같은 회차에서 조회가
+실패하거나 시간 초과될 때만 경고와 함께 대체로 사용한다. 저장본이 있으면 ETag/Last-Modified
+조건부 요청으로 변경 여부를 확인한다.
+
+저장 위치는 NUMBERS_CACHE_DIR (기본값 ~/.local/state/lottery-bot/numbers)이며,
+워크플로가 캐시하는 ~/.cache/lottery-bot과 분리되어 있다.
+
+모든 출처의 번호는 브라우저 작업 전에 검증한다 (게임당 1~45 사이 서로 다른 숫자 6개, 게임 간 중복 없음).
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+import draw_calendar
+
+NUMBERS_PER_GAME = 6
+MIN_NUMBER = 1
+MAX_NUMBER = 45
+
+_session = requests.Session()
+
+
+def validate_games(games: list, count: int = None) -> list:
+    """
+    게임 번호 검증 및 정규화
+
+    Args:
+        games: [{"numbers": [...]}, ...] 또는 [[...], ...]
+        count: 사용할 게임 수 (None이면 전부)
+
+    Returns:
+        [{"game": 1, "numbers": [1, 7, 15, 23, 35, 42]}, ...]
+
+    Raises:
+        ValueError: 번호가 규칙에 맞지 않을 때
+    """
+    normalized = []
+    seen = set()
+    for index, game in enumerate(games, start=1):
+        numbers = game.get("numbers") if isinstance(game, dict) else game
+        try:
+            numbers = [int(n) for n in numbers]
+        except (TypeError, ValueError):
+            raise ValueError(f"게임 {index}: 숫자가 아닌 번호가 있습니다 ({numbers})")
+
+        if len(numbers) != NUMBERS_PER_GAME:
+            raise ValueError(f"게임 {index}: 번호는 {NUMBERS_PER_GAME}개여야 합니다 ({numbers})")
+        if len(set(numbers)) != NUMBERS_PER_GAME:
+            raise ValueError(f"게임 {index}: 중복된 번호가 있습니다 ({numbers})")
+        if any(n < MIN_NUMBER or n > MAX_NUMBER for n in numbers):
+            raise ValueError(f"게임 {index}: 번호는 {MIN_NUMBER}~{MAX_NUMBER} 사이여야 합니다 ({numbers})")
+
+        key = tuple(sorted(numbers))
+        if key in seen:
+            raise ValueError(f"게임 {index}: 앞선 게임과 같은 번호입니다 ({numbers})")
+        seen.add(key)
+        normalized.append({"game": index, "numbers": numbers})
+
+    if count is not None:
+        normalized = normalized[:count]
+    return normalized
+
+
+def _parse_text(text: str) -> list:
+    """JSON 또는 "1,2,3,4,5,6;7,8,..." 형식의 번호 목록"""
+    text = text.strip()
+    if text.startswith("[") or text.startswith("{"):
+        data = json.loads(text)
+        return data.get("games", []) if isinstance(data, dict) else data
+    return [game.split(",") for game in text.split(";") if game.strip()]
+
+
+def _read_file(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            return [
+                [cell for cell in row if cell.strip()]
+                for row in csv.reader(f)
+                if any(cell.strip() for cell in row)
+            ]
+        return _parse_text(f.read())
+
+
+def local_source() -> str:
+    """설정된 로컬 번호 출처 이름 ("env", "file"), 없으면 빈 문자열"""
+    if os.environ.get("MANUAL_NUMBERS", "").strip():
+        return "env"
+    if os.environ.get("NUMBERS_FILE", ""):
+        return "file"
+    return ""
+
+
+def is_configured(sheet_api_url: str = None) -> bool:
+    """수동 모드에 사용할 번호 출처가 하나라도 있는지"""
+    return bool(local_source() or sheet_api_url)
+
+
+class SheetCache:
+    """Apps Script 응답 저장본 (URL, 추첨 회차별 JSON 파일)"""
+
+    def __init__(self, directory: str = None):
+        default = os.path.join(os.path.expanduser("~"), ".local", "state", "lottery-bot", "numbers")
+        self.directory = directory or os.environ.get("NUMBERS_CACHE_DIR", default)
+
+    def _path(self, url: str, round_no: int) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"numbers_{digest}_{round_no}.json")
+
+    def load(self, url: str, round_no: int):
+        try:
+            with open(self._path(url, round_no), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, url: str, round_no: int, entry: dict) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(url, round_no))
+        except OSError as e:
+            print(f"⚠️ 번호 저장 실패: {e}")
+
+
+def _sheet_timeout() -> tuple:
+    """(connect, read) 타임아웃 - Apps Script 콜드 스타트는 응답이 느리므로 read를 길게"""
+    connect = float(os.environ.get("SHEET_CONNECT_TIMEOUT", "5"))
+    read = float(os.environ.get("SHEET_READ_TIMEOUT", "20"))
+    return connect, read
+
+
+def _fetch_sheet(url: str, count: int, cached: dict = None) -> dict:
+    """
+    Apps Script 조회 (캐시가 있으면 조건부 요청)
+
+    Returns:
+        캐시 항목 {"fetched_at", "count", "etag", "last_modified", "digest", "games"}
+    """
+    separator = "&" if "?" in url else "?"
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = _session.get(f"{url}{separator}count={count}", headers=headers, timeout=_sheet_timeout())
+    if response.status_code == 304 and cached:
+        return dict(cached, fetched_at=time.time())
+    response.raise_for_status()
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    if cached and cached.get("digest") == digest:
+        return dict(cached, fetched_at=time.time())
+
+    data = response.json()
+    if not data.get("success"):
+        raise ValueError(f"API 오류: {data.get('error', 'Unknown error')}")
+
+    return {
+        "fetched_at": time.time(),
+        "count": count,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "digest": digest,
+        "games": validate_games(data.get("games", [])),
+    }
+
+
+def _sheet_numbers(url: str, count: int, allow_network: bool = True):
+    if not allow_network:
+        return None
+
+    round_no = draw_calendar.current_round(draw_calendar.LOTTO645)
+    cache = SheetCache()
+    cached = cache.load(url, round_no)
+    if cached and cached.get("count", 0) < count:
+        # 더 적은 게임 수로 저장된 응답은 대체로 쓸 수 없음 (조건부 요청 검증자도 무효)
+        cached = None
+
+    try:
+        entry = _fetch_sheet(url, count, cached)
+    except (requests.RequestException, ValueError) as e:
+        if cached:
+            fetched_at = time.strftime("%m-%d %H:%M", time.localtime(cached.get("fetched_at", 0)))
+            print(f"⚠️ 번호 조회 실패, {round_no}회 저장본 사용 ({fetched_at} 조회, 시트 변경이 반영되지 않았을 수 있음): {e}")
+            return cached["games"]
+        raise
+    cache.save(url, round_no, entry)
+    return entry["games"]
+
+
+def get_numbers(count: int, sheet_api_url: str = None, allow_network: bool = True):
+    """
+    수동 모드 번호 조회
+
+    Args:
+        count: 필요한 게임 수
+        sheet_api_url: Apps Script Web App URL (로컬 출처가 없을 때 사용)
+        allow_network: False이면 로컬 출처만 확인하고, 시트 조회가 필요하면 None 반환
+
+    Returns:
+        검증된 게임 목록 [{"game": 1, "numbers": [...]}, ...]
+
+    Raises:
+        ValueError: 번호 검증 실패 또는 출처 없음
+        requests.RequestException: Apps Script 조회 실패 (같은 회차 저장본도 없을 때)
+    """
+    source = local_source()
+    if source == "env":
+        games = _parse_text(os.environ["MANUAL_NUMBERS"])
+    elif source == "file":
+        games = _read_file(os.environ["NUMBERS_FILE"])
+    elif sheet_api_url:
+        games = _sheet_numbers(sheet_api_url, count, allow_network=allow_network)
+        if games is None:
+            return None
+    else:
+        raise ValueError("수동 모드 번호 출처가 없습니다 (MANUAL_NUMBERS, NUMBERS_FILE 또는 SHEET_API_URL)")
+
+    return validate_games(games, count=count)
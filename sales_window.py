@@ -0,0 +1,93 @@
+"""
+로또645 인터넷 판매 시간 모델 (KST)
+
+    - 매일 00:00 ~ 06:00 판매 중지 (시스템 점검 시간)
+    - 토요일 20:00 판매 마감 ~ 일요일 06:00 판매 재개 (추첨)
+
+명절 등 추가 판매 중지 기간은 SALES_OVERRIDES_FILE(JSON)로 지정한다.
+    {"closed": [{"start": "2026-02-16T00:00", "end": "2026-02-18T06:00", "reason": "설 연휴"}]}
+
+브라우저나 HTTP 세션을 시작하기 전에 판매 여부를 판단해 판매 시간 외 실행을 빠르게 종료한다.
+"""
+
+import json
+import os
+
+from datetime import datetime, timedelta
+
+from draw_calendar import KST, now_kst
+
+_SATURDAY = 5
+_OPEN_HOUR = 6
+_SATURDAY_CLOSE_HOUR = 20
+
+_overrides_cache = None
+
+
+def _load_overrides() -> list:
+    global _overrides_cache
+    if _overrides_cache is not None:
+        return _overrides_cache
+
+    overrides = []
+    path = os.environ.get("SALES_OVERRIDES_FILE", "")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        for item in raw.get("closed", []):
+            start = datetime.fromisoformat(item["start"])
+            end = datetime.fromisoformat(item["end"])
+            overrides.append({
+                "start": start if start.tzinfo else start.replace(tzinfo=KST),
+                "end": end if end.tzinfo else end.replace(tzinfo=KST),
+                "reason": item.get("reason", "override"),
+            })
+
+    _overrides_cache = overrides
+    return overrides
+
+
+def _closed_interval(at: datetime):
+    """
+    at 시각이 판매 중지 구간이면 (구간 종료 시각, 사유), 판매 중이면 None
+    """
+    for override in _load_overrides():
+        if override["start"] <= at < override["end"]:
+            return override["end"], override["reason"]
+
+    day_open = at.replace(hour=_OPEN_HOUR, minute=0, second=0, microsecond=0)
+    if at < day_open:
+        return day_open, "maintenance"
+
+    if at.weekday() == _SATURDAY and at.hour >= _SATURDAY_CLOSE_HOUR:
+        return day_open + timedelta(days=1), "weekly_draw"
+
+    return None
+
+
+def status(now: datetime = None) -> dict:
+    """
+    현재 판매 상태
+
+    Args:
+        now: 기준 시각 (None이면 현재 KST, naive datetime은 KST로 간주)
+
+    Returns:
+        {"open": bool, "reason": str|None, "opens_at": datetime}
+        판매 중이면 opens_at은 now와 같다.
+    """
+    now = now or now_kst()
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=KST)
+
+    reason = None
+    opens_at = now
+    # 점검 종료 직후 다른 중지 구간(명절 등)이 이어질 수 있으므로 판매 중인 시각까지 반복
+    for _ in range(32):
+        closed = _closed_interval(opens_at)
+        if closed is None:
+            break
+        opens_at, interval_reason = closed
+        reason = reason or interval_reason
+
+    return {"open": reason is None, "reason": reason, "opens_at": opens_at}
@@ -0,0 +1,122 @@
+"""
+스크린샷 캡처 서브시스템
+
+캡처한 프레임은 메모리 링 버퍼에 보관하고 실패 시(또는 요청 시)에만 디스크에 기록한다.
+디코딩과 파일 쓰기는 백그라운드 스레드에서 처리해 구매 흐름을 막지 않는다.
+(화면 캡처 자체는 WebDriver 요청이므로 호출 스레드에서 수행)
+
+기본 수준(failure)에서도 단계마다 캡처하므로, 전체 PNG 대신 CDP Page.captureScreenshot의
+JPEG 인코딩으로 캡처 비용과 크기를 줄인다. (CDP를 쓸 수 없으면 PNG로 대체)
+
+환경변수:
+    SCREENSHOT_LEVEL: off(캡처 안 함) | failure(기본값, 실패 시에만 기록) | all(모두 기록)
+    SCREENSHOT_BUFFER: 링 버퍼에 보관할 최근 프레임 수 (기본값 10)
+    SCREENSHOT_QUALITY: JPEG 품질 1~100 (기본값 60)
+"""
+
+import base64
+import os
+import threading
+import weakref
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+LEVELS = ("off", "failure", "all")
+
+
+class ScreenshotRecorder:
+    def __init__(self, driver, prefix: str = "", level: str = None, capacity: int = None):
+        self.driver = driver
+        self.prefix = prefix
+        self.level = (level or os.getenv("SCREENSHOT_LEVEL", "failure")).lower()
+        if self.level not in LEVELS:
+            raise ValueError(f"Unknown SCREENSHOT_LEVEL: {self.level} (choose from {', '.join(LEVELS)})")
+
+        self.output_dir = os.getenv("GITHUB_WORKSPACE", ".")
+        self._frames = deque(maxlen=capacity or int(os.getenv("SCREENSHOT_BUFFER", "10")))
+        self.quality = min(max(int(os.getenv("SCREENSHOT_QUALITY", "60")), 1), 100)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+        self._pending = []
+
+    def capture(self, name: str) -> None:
+        """
+        현재 화면을 버퍼에 저장 ("error"로 시작하는 이름은 실패로 보고 버퍼 전체를 기록)
+        """
+        if self.level == "off":
+            return
+
+        try:
+            data, extension = self._grab()
+        except Exception as e:
+            print(f"⚠️ 스크린샷 캡처 실패: {e}")
+            return
+
+        frame = {"name": name, "data": data, "extension": extension, "written": False}
+        with self._lock:
+            self._frames.append(frame)
+
+        if self.level == "all":
+            self._write_async(frame)
+        if name.startswith("error"):
+            self.flush()
+
+    def _grab(self) -> tuple:
+        """현재 화면 (base64 데이터, 확장자) - CDP JPEG 캡처, 실패 시 WebDriver PNG 캡처"""
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Page.captureScreenshot", {"format": "jpeg", "quality": self.quality}
+            )
+            return result["data"], "jpg"
+        except Exception:
+            return self.driver.get_screenshot_as_base64(), "png"
+
+    def flush(self) -> None:
+        """버퍼에 남은(아직 기록되지 않은) 프레임을 백그라운드에서 디스크에 기록"""
+        with self._lock:
+            frames = [frame for frame in self._frames if not frame["written"]]
+        for frame in frames:
+            self._write_async(frame)
+
+    def close(self, timeout: float = 10) -> None:
+        """대기 중인 기록이 끝날 때까지 최대 timeout초 대기"""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending, timeout=timeout)
+        self._executor.shutdown(wait=False)
+
+    def _write_async(self, frame: dict) -> None:
+        with self._lock:
+            if frame["written"]:
+                return
+            frame["written"] = True
+            self._pending.append(self._executor.submit(self._write, frame["name"], frame["data"], frame["extension"]))
+
+    def _write(self, name: str, data: str, extension: str = "png") -> None:
+        filename = f"screenshot_{self.prefix}_{name}.{extension}" if self.prefix else f"screenshot_{name}.{extension}"
+        filepath = os.path.join(self.output_dir, filename)
+        try:
+            with open(filepath, "wb") as f:
+                f.write(base64.b64decode(data))
+            print(f"📸 스크린샷 저장: {filepath}")
+        except Exception as e:
+            print(f"⚠️ 스크린샷 저장 실패: {e}")
+
+
+_recorders = weakref.WeakKeyDictionary()
+
+
+def attach(driver, prefix: str = "") -> ScreenshotRecorder:
+    """드라이버에 새 ScreenshotRecorder 연결 (파일명 접두어 지정)"""
+    recorder = ScreenshotRecorder(weakref.proxy(driver), prefix=prefix)
+    _recorders[driver] = recorder
+    return recorder
+
+
+def get_recorder(driver) -> ScreenshotRecorder:
+    """드라이버별 ScreenshotRecorder (연결된 것이 없으면 접두어 없이 생성)"""
+    recorder = _recorders.get(driver)
+    if recorder is None:
+        recorder = attach(driver)
+    return recorder
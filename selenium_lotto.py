@@ -5,59 +5,207 @@ Selenium 기반 로또645 구매 자동화 모듈
 Selenium 브라우저 자동화로 전환
 """
 
+import base64
+import json
 import os
 import time
 import requests
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException
 
+import auth
+import browser_profile
+import driver_provision
+import lotto645
+import number_provider
+import screenshots
+from HttpClient import HttpClientPool
+from selenium_waits import get_waiter
 
-def fetch_numbers_from_sheet(api_url: str, count: int = 10) -> list:
+# 번호 선택 확인 후 체크된 번호가 초기화되었는지 확인
+_NO_CHECKED_NUMBER_SCRIPT = "return document.querySelectorAll(\"input[id^='check645num']:checked\").length === 0"
+
+
+# 페이지 스크립트 공용 표시 여부 판단
+# 레이어는 position: fixed인 경우가 많아 offsetParent 대신 렌더링 박스로 표시 여부 판단
+_IS_VISIBLE_JS = """
+function isVisible(el) {
+    return !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+"""
+
+
+class PageState(Enum):
+    READY = "ready"                      # 구매 가능 (번호 선택/자동번호발급 영역 존재)
+    NO_ROUND_INFO = "no_round_info"      # 회차정보가 존재하지 않습니다
+    CLOSED = "closed"                    # 현재 구매 가능한 복권이 없습니다 (판매 마감/시간 외)
+    SESSION_EXPIRED = "session_expired"  # 세션 해제/시간 초과
+    UNKNOWN = "unknown"
+
+
+# 페이지 안에서 상태를 판별해 짧은 문자열만 반환 (page_source 전체 전송 대신 사용)
+# 메시지는 화면에 보이는 텍스트(innerText)만 검사해 숨겨진 팝업 템플릿에 반응하지 않도록 함
+_PAGE_STATE_SCRIPT = _IS_VISIBLE_JS + """
+var text = document.body ? document.body.innerText : '';
+function has(s) { return text.indexOf(s) >= 0; }
+// 본문은 명확한 세션 만료 메시지(두 문구 모두)만, 로그인 요청 문구는 보이는 알림 레이어 안에서만 인정
+var alertLayer = document.getElementById('popupLayerAlert');
+var alertText = isVisible(alertLayer) ? alertLayer.innerText : '';
+if ((has('세션이 해제') && has('시간 초과')) || alertText.indexOf('로그인해 주시기 바랍니다') >= 0) { return 'session_expired'; }
+if (has('현재 구매 가능한 복권이 없습니다')) { return 'closed'; }
+if (has('회차정보가 존재하지 않습니다')) { return 'no_round_info'; }
+if (document.querySelector("#num1, #btnSelectNum, label[for^='check645num'], .ball645")) { return 'ready'; }
+return 'unknown';
+"""
+
+
+# 구매 후 떠 있는 결과/확인 레이어를 닫고, 여전히 보이는 레이어 id 목록 반환
+_CLOSE_RESULT_LAYERS_SCRIPT = _IS_VISIBLE_JS + """
+var selectors = ['#popReceipt', '#popupLayerConfirm', '#popupLayerAlert', '#report'];
+var closers = "input[value='닫기'], input[value='확인'], a.close, .btn_close, button.close";
+var stillOpen = [];
+for (var i = 0; i < selectors.length; i++) {
+    var layer = document.querySelector(selectors[i]);
+    if (!isVisible(layer)) { continue; }
+    var closer = layer.querySelector(closers);
+    if (closer) { closer.click(); }
+    if (isVisible(layer)) { stillOpen.push(selectors[i]); }
+}
+return stillOpen;
+"""
+
+
+# 구매 후 바뀌는 구매 영역 상태 (새로 로드한 페이지의 값과 비교해 초기화 여부 판단)
+_PURCHASE_STATE_SCRIPT = _IS_VISIBLE_JS + """
+var buyBtn = document.getElementById('btnBuy');
+var amount = document.getElementById('payAmt');
+return {
+    receipt_open: isVisible(document.getElementById('popReceipt')),
+    buy_enabled: !!buyBtn && !buyBtn.disabled && isVisible(buyBtn),
+    checked: document.querySelectorAll("input[id^='check645num']:checked").length,
+    amount: amount ? amount.innerText.trim() : null,
+    filled_slots: document.querySelectorAll("[class*='ball_645']").length
+};
+"""
+
+
+def purchase_state(driver: webdriver.Chrome):
+    """
+    구매 영역 상태 (영수증 레이어, 구매 버튼 활성화, 선택된 번호/슬롯, 결제 금액)
+
+    Returns:
+        상태 딕셔너리, alert가 떠 있거나 실패하면 None
+    """
+    try:
+        driver.switch_to.alert
+        return None
+    except NoAlertPresentException:
+        pass
+
+    try:
+        return driver.execute_script(_PURCHASE_STATE_SCRIPT)
+    except Exception as e:
+        print(f"⚠️ 구매 영역 상태 확인 실패: {e}")
+        return None
+
+
+def probe_page_state(driver: webdriver.Chrome) -> PageState:
+    """
+    현재 페이지 상태 판별 (스크립트 1회 실행)
+
+    Returns:
+        PageState (alert가 떠 있거나 스크립트 실행에 실패하면 UNKNOWN)
     """
-    구글 스프레드시트에서 로또 번호 가져오기
+    try:
+        driver.switch_to.alert
+        return PageState.UNKNOWN
+    except NoAlertPresentException:
+        pass
+
+    try:
+        return PageState(driver.execute_script(_PAGE_STATE_SCRIPT))
+    except Exception as e:
+        print(f"⚠️ 페이지 상태 확인 실패: {e}")
+        return PageState.UNKNOWN
+
+
+# 여러 게임의 번호 선택과 확인을 페이지 안에서 한 번에 수행하고 번호별 상태를 반환
+# 상태: checked(선택됨) / unchecked(클릭했지만 선택되지 않음) / missing(번호 요소 없음)
+_BATCH_ENTRY_SCRIPT = _IS_VISIBLE_JS + """
+var games = arguments[0];
+var results = [];
+
+function closeAlertPopup() {
+    var btn = document.querySelector("#popupLayerAlert input.button[value='확인']");
+    if (isVisible(btn)) { btn.click(); }
+}
+
+for (var g = 0; g < games.length; g++) {
+    var numbers = games[g];
+    var statuses = [];
+
+    for (var i = 0; i < numbers.length; i++) {
+        var num = numbers[i];
+        var label = document.querySelector("label[for='check645num" + num + "']");
+        var checkbox = document.getElementById("check645num" + num);
+        if (!label || !checkbox) {
+            statuses.push({num: num, status: "missing"});
+            continue;
+        }
+        if (!checkbox.checked) { label.click(); }
+        statuses.push({num: num, status: checkbox.checked ? "checked" : "unchecked"});
+    }
+
+    closeAlertPopup();
+
+    var selectBtn = document.getElementById("btnSelectNum");
+    if (selectBtn) { selectBtn.click(); }
+    closeAlertPopup();
+
+    var remaining = document.querySelectorAll("input[id^='check645num']:checked").length;
+    results.push({numbers: statuses, confirmed: !!selectBtn && remaining === 0});
+}
+return results;
+"""
+
+
+def fetch_numbers_from_sheet(api_url: str, count: int = 10, allow_network: bool = True):
+    """
+    수동 모드 로또 번호 가져오기 (number_provider: 환경변수/로컬 파일/스프레드시트)
     
     Args:
         api_url: Apps Script Web App URL
         count: 가져올 게임 수 (1-10, 기본값 10)
+        allow_network: False이면 로컬 출처만 확인 (시트 조회가 필요하면 None 반환)
     
     Returns:
-        게임 번호 리스트 [{"game": 1, "numbers": [1,7,15,23,35,42]}, ...]
+        게임 번호 리스트 [{"game": 1, "numbers": [1,7,15,23,35,42]}, ...] (실패 시 빈 리스트)
     """
-    print(f"📊 스프레드시트에서 {count}게임 번호 조회 중...")
+    print(f"📊 수동 번호 {count}게임 조회 중...")
     
     try:
-        # count 파라미터 추가
-        separator = "&" if "?" in api_url else "?"
-        url_with_count = f"{api_url}{separator}count={count}"
-        
-        response = requests.get(url_with_count, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        if not data.get("success"):
-            print(f"❌ API 오류: {data.get('error', 'Unknown error')}")
-            return []
-        
-        games = data.get("games", [])
-        print(f"✓ {len(games)}개 게임 번호 조회 완료")
-        
-        for game in games:
-            print(f"   게임 {game['game']}: {game['numbers']}")
-        
-        return games
-        
+        games = number_provider.get_numbers(count, sheet_api_url=api_url, allow_network=allow_network)
     except requests.RequestException as e:
         print(f"❌ 번호 조회 실패: {e}")
         return []
     except Exception as e:
-        print(f"❌ 번호 파싱 실패: {e}")
+        print(f"❌ 번호 검증 실패: {e}")
         return []
+    
+    if games is None:
+        return None
+    
+    print(f"✓ {len(games)}개 게임 번호 조회 완료")
+    for game in games:
+        print(f"   게임 {game['game']}: {game['numbers']}")
+    
+    return games
 
 
 def buy_manual(driver: webdriver.Chrome, games: list, game_limit: int = None) -> bool:
@@ -78,6 +226,33 @@ def buy_manual(driver: webdriver.Chrome, games: list, game_limit: int = None) ->
         print(f"ℹ️ 게임 수 제한: {game_limit}게임만 입력")
     
     print(f"🎯 수동 번호 {len(games)}게임 입력 중...")
+    waiter = get_waiter(driver)
+
+    # 기본: 라운드(최대 5게임)당 스크립트 1회로 입력, 스크립트 실행 자체가 실패하면 번호별 클릭 방식으로 대체
+    if os.getenv("MANUAL_ENTRY", "batch").lower() == "batch":
+        confirmed = _enter_games_batched(driver, games)
+        if confirmed is not None:
+            if not confirmed:
+                save_screenshot(driver, "error_manual_input")
+            return confirmed
+        # 스크립트가 중간에 실패했으면 일부 게임이 이미 A-E 슬롯에 확정되었을 수 있으므로
+        # 체크 해제가 아니라 game645.do를 새로 로드한 뒤 번호별 입력으로 재시도
+        print("ℹ️ 일괄 입력 스크립트 실패 - 페이지를 다시 불러와 번호별 입력으로 재시도")
+        try:
+            driver.switch_to.alert.accept()
+        except NoAlertPresentException:
+            pass
+        except Exception as e:
+            print(f"   ⚠️ alert 닫기 실패: {e}")
+        
+        try:
+            reloaded = navigate_to_lotto645(driver) and open_purchase_popup(driver)
+        except Exception as e:
+            print(f"   ⚠️ 페이지 재로드 실패: {e}")
+            reloaded = False
+        if not reloaded:
+            save_screenshot(driver, "error_manual_input")
+            return False
     
     try:
         for game in games:
@@ -87,32 +262,45 @@ def buy_manual(driver: webdriver.Chrome, games: list, game_limit: int = None) ->
             # 각 번호 버튼 클릭
             for num in numbers:
                 try:
-                    num_label = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, f"label[for='check645num{num}']"))
+                    num_label = waiter.until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, f"label[for='check645num{num}']")),
+                        5,
+                        "number_label"
                     )
                     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", num_label)
-                    time.sleep(0.1)
                     driver.execute_script("arguments[0].click();", num_label)
-                    time.sleep(0.1)
                 except Exception as e:
                     print(f"   ⚠️ 번호 {num} 클릭 실패: {e}")
             
             # 번호 선택 확인 버튼 클릭
             try:
                 # 알림 팝업 있으면 먼저 닫기
-                try:
-                    alert_close = driver.find_element(By.CSS_SELECTOR, "#popupLayerAlert input.button[value='확인']")
-                    driver.execute_script("arguments[0].click();", alert_close)
-                    time.sleep(0.3)
-                except:
-                    pass
+                alert_close = waiter.find_optional(By.CSS_SELECTOR, "#popupLayerAlert input.button[value='확인']", "probe_alert_popup")
+                if alert_close is not None:
+                    try:
+                        driver.execute_script("arguments[0].click();", alert_close)
+                        waiter.optional(
+                            EC.invisibility_of_element_located((By.ID, "popupLayerAlert")),
+                            2,
+                            "alert_popup_closed"
+                        )
+                    except Exception:
+                        pass
                 
-                select_btn = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.ID, "btnSelectNum"))
+                select_btn = waiter.until(
+                    EC.presence_of_element_located((By.ID, "btnSelectNum")),
+                    5,
+                    "btn_select_num"
                 )
                 driver.execute_script("arguments[0].click();", select_btn)
                 print(f"   ✓ 게임 {game_num}: {numbers}")
-                time.sleep(0.5)
+
+                # 선택한 번호가 슬롯으로 옮겨져 체크가 해제될 때까지 대기
+                waiter.optional(
+                    lambda d: d.execute_script(_NO_CHECKED_NUMBER_SCRIPT),
+                    2,
+                    "game_confirmed"
+                )
             except Exception as e:
                 print(f"   ⚠️ 게임 {game_num} 확인 실패: {e}")
         
@@ -125,6 +313,40 @@ def buy_manual(driver: webdriver.Chrome, games: list, game_limit: int = None) ->
         return False
 
 
+def _enter_games_batched(driver: webdriver.Chrome, games: list):
+    """
+    주입 스크립트 1회로 여러 게임 번호 선택 및 확인
+
+    Args:
+        driver: WebDriver 인스턴스
+        games: 게임 번호 리스트 [{"game": 1, "numbers": [1,7,15,23,35,42]}, ...]
+
+    Returns:
+        모든 게임이 확인되었으면 True, 일부 번호/게임이 실패하면 False,
+        스크립트 실행 자체가 실패하면 None
+    """
+    started_at = time.monotonic()
+    try:
+        results = driver.execute_script(_BATCH_ENTRY_SCRIPT, [game["numbers"] for game in games])
+    except Exception as e:
+        print(f"   ⚠️ 일괄 입력 스크립트 실패: {e}")
+        return None
+
+    all_confirmed = True
+    for game, game_result in zip(games, results):
+        failed = [n for n in game_result["numbers"] if n["status"] != "checked"]
+        if failed:
+            print(f"   ⚠️ 게임 {game['game']} 번호 선택 실패: {failed}")
+        if game_result["confirmed"] and not failed:
+            print(f"   ✓ 게임 {game['game']}: {game['numbers']}")
+        else:
+            all_confirmed = False
+
+    elapsed = time.monotonic() - started_at
+    print(f"✓ {len(games)}게임 일괄 입력 ({elapsed:.2f}초)")
+    return all_confirmed
+
+
 def click_purchase_button(driver: webdriver.Chrome) -> bool:
     """
     구매하기 버튼 클릭
@@ -136,15 +358,22 @@ def click_purchase_button(driver: webdriver.Chrome) -> bool:
         성공 여부
     """
     print("💰 구매하기 버튼 클릭 중...")
+    waiter = get_waiter(driver)
     
     try:
         # 구매하기 버튼 찾기
         try:
-            buy_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "btnBuy"))
+            buy_btn = waiter.until(
+                EC.element_to_be_clickable((By.ID, "btnBuy")),
+                10,
+                "btn_buy_clickable"
             )
-        except:
-            buy_btn = driver.find_element(By.ID, "btnBuy")
+        except TimeoutException:
+            buy_btn = waiter.find_optional(By.ID, "btnBuy", "probe_btn_buy")
+            if buy_btn is None:
+                print("⚠️ 구매하기 버튼을 찾을 수 없습니다")
+                save_screenshot(driver, "error_btn_missing")
+                return False
         
         # 버튼 비활성화 확인
         if buy_btn.get_attribute("disabled"):
@@ -155,24 +384,32 @@ def click_purchase_button(driver: webdriver.Chrome) -> bool:
         # JavaScript로 클릭 (안정성)
         driver.execute_script("arguments[0].click();", buy_btn)
         print("✓ 구매하기 버튼 클릭!")
-        time.sleep(2)
+        
+        # 확인 alert 또는 구매 확인 팝업 중 먼저 나타나는 쪽까지 대기
+        confirm_locator = (By.CSS_SELECTOR, "#popupLayerConfirm input.button.lrg.confirm[value='확인']")
+        waiter.optional(
+            EC.any_of(EC.alert_is_present(), EC.element_to_be_clickable(confirm_locator)),
+            10,
+            "buy_confirm_shown"
+        )
         
         # 확인 팝업 처리 (alert)
         try:
             alert = driver.switch_to.alert
             alert.accept()
-            time.sleep(1)
         except:
             pass
         
         # 구매 확인 팝업 버튼 클릭
         try:
-            confirm_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "#popupLayerConfirm input.button.lrg.confirm[value='확인']"))
+            confirm_btn = waiter.until(
+                EC.element_to_be_clickable(confirm_locator),
+                10,
+                "buy_confirm_popup"
             )
             confirm_btn.click()
             print("✓ 구매 확인!")
-            time.sleep(2)
+            waiter.network_idle("buy_request_done")
         except:
             pass
         
@@ -186,16 +423,74 @@ def click_purchase_button(driver: webdriver.Chrome) -> bool:
         return False
 
 
-def create_driver(headless: bool = True) -> webdriver.Chrome:
+def capture_exec_buy_responses(driver: webdriver.Chrome) -> list:
+    """
+    페이지가 받은 execBuy.do 응답을 CDP 성능 로그에서 읽어 파싱
+
+    성능 로그는 읽을 때마다 비워지므로 라운드마다 호출하면 해당 라운드의 응답만 반환된다.
+
+    Returns:
+        execBuy.do 응답 JSON 리스트 (예: [{"loginYn": "Y", "result": {"buyRound": ..., "arrGameChoiceNum": [...]}}])
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        print(f"⚠️ 성능 로그 조회 실패: {e}")
+        return []
+
+    request_ids = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params", {})
+        if "execBuy.do" in params.get("response", {}).get("url", ""):
+            request_ids.append(params["requestId"])
+
+    def get_body(request_id: str):
+        try:
+            return driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            return None
+
+    waiter = get_waiter(driver)
+    responses = []
+    for request_id in request_ids:
+        # 응답 본문은 로딩이 끝나야 조회 가능하므로 짧게 대기
+        body = get_body(request_id) or waiter.optional(lambda d: get_body(request_id), 3, "exec_buy_body")
+        if not body:
+            print("⚠️ execBuy.do 응답 본문을 읽을 수 없습니다")
+            continue
+
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8")
+        try:
+            responses.append(json.loads(text))
+        except ValueError:
+            print(f"⚠️ execBuy.do 응답 파싱 실패: {text[:100]}")
+
+    return responses
+
+
+def create_driver(headless: bool = True, profile_dir: str = None, report: dict = None) -> webdriver.Chrome:
     """
     Chrome WebDriver 생성
     
     Args:
         headless: True면 화면 없이 실행 (GitHub Actions용)
+        profile_dir: 영구 user-data-dir 경로 (None이면 매번 새 임시 프로필)
+        report: 전달하면 시작 방식과 소요 시간을 기록
+                {"driver_source": "cache"|"manager", "profile": "persistent"|"temporary",
+                 "start": "warm"|"cold", "resolve_seconds", "launch_seconds"}
     
     Returns:
         Chrome WebDriver 인스턴스
     """
+    started_at = time.monotonic()
     options = Options()
     
     if headless:
@@ -213,12 +508,45 @@ def create_driver(headless: bool = True) -> webdriver.Chrome:
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
     
-    # WebDriver 생성
-    service = Service(ChromeDriverManager().install())
+    # lean 프로필: 이미지/폰트 차단 prefs, eager 로드 전략
+    browser_profile.apply_options(options)
+    
+    # 성능 로그(CDP Network 이벤트) 수집: execBuy.do 응답에서 구매 번호를 읽기 위해 사용
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
+    # 영구 프로필: HTTP 캐시와 쿠키가 다음 실행까지 유지됨
+    profile_existed = bool(profile_dir) and os.path.isdir(profile_dir)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    
+    # WebDriver 생성 (chromedriver 경로는 Chrome 버전이 같으면 캐시 사용)
+    driver_path, driver_source = driver_provision.resolve_driver_path()
+    resolved_at = time.monotonic()
+    service = Service(driver_path)
     driver = webdriver.Chrome(service=service, options=options)
+    launched_at = time.monotonic()
+
+    warm = driver_source == "cache" and profile_existed
+    startup = {
+        "driver_source": driver_source,
+        "profile": "persistent" if profile_dir else "temporary",
+        "start": "warm" if warm else "cold",
+        "resolve_seconds": round(resolved_at - started_at, 2),
+        "launch_seconds": round(launched_at - resolved_at, 2),
+    }
+    print(
+        f"🚀 Chrome {startup['start']} start: driver {driver_source} {startup['resolve_seconds']}초, "
+        f"launch {startup['launch_seconds']}초 ({startup['profile']} profile)"
+    )
+    if report is not None:
+        report.update(startup)
     
-    # 암묵적 대기 설정
-    driver.implicitly_wait(10)
+    # 암묵적 대기는 사용하지 않음: 없는 요소 조회가 즉시 반환되도록 하고,
+    # 필요한 대기는 selenium_waits의 명시적 조건으로 처리
+    driver.implicitly_wait(0)
+
+    # lean 프로필: CDP로 불필요한 리소스 URL 차단
+    browser_profile.apply_network_rules(driver)
     
     return driver
 
@@ -236,43 +564,56 @@ def login(driver: webdriver.Chrome, user_id: str, password: str) -> bool:
         로그인 성공 여부
     """
     print("🏠 메인 페이지 접속 중...")
-    driver.get("https://www.dhlottery.co.kr/main")
+    waiter = get_waiter(driver)
+    browser_profile.navigate(driver, "https://www.dhlottery.co.kr/main", "main")
     
-    time.sleep(2)  # 페이지 로딩 대기
+    waiter.dom_ready("main_page")
     save_screenshot(driver, "01_main_page")
     
     try:
         # 로그인 버튼/링크 찾기 (메인 페이지에서)
         print("🔐 로그인 페이지로 이동 중...")
-        login_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.btn_common.sml.blu, a[href*='login'], .header_login a"))
+        login_link = waiter.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.btn_common.sml.blu, a[href*='login'], .header_login a")),
+            10,
+            "login_link"
         )
         login_link.click()
         
-        time.sleep(3)  # 로그인 페이지 로딩 대기
-        save_screenshot(driver, "02_login_page")
-        
-        # ID 입력 - element_to_be_clickable로 대기
+        # ID 입력 - element_to_be_clickable로 대기 (로그인 페이지 로딩 완료 기준)
         print("ID 입력 필드 대기 중...")
-        user_id_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "inpUserId"))
+        user_id_input = waiter.until(
+            EC.element_to_be_clickable((By.ID, "inpUserId")),
+            10,
+            "login_page"
         )
+        browser_profile.record_navigation(driver, "login_page")
+        save_screenshot(driver, "02_login_page")
         driver.execute_script("arguments[0].value = arguments[1]", user_id_input, user_id)
         
         # 비밀번호 입력
-        password_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "inpUserPswdEncn"))
+        password_input = waiter.until(
+            EC.element_to_be_clickable((By.ID, "inpUserPswdEncn")),
+            10,
+            "password_input"
         )
         driver.execute_script("arguments[0].value = arguments[1]", password_input, password)
         
         # 로그인 버튼 클릭
-        login_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "btnLogin"))
+        login_btn = waiter.until(
+            EC.element_to_be_clickable((By.ID, "btnLogin")),
+            10,
+            "login_button"
         )
         login_btn.click()
         
-        # 로그인 완료 대기
-        time.sleep(3)
+        # 로그인 완료 대기 (로그인 페이지를 벗어나거나 로그아웃 링크가 나타날 때까지)
+        waiter.optional(
+            lambda d: "login" not in d.current_url.lower() or "로그아웃" in d.execute_script("return document.body ? document.body.innerText : ''"),
+            10,
+            "login_complete"
+        )
+        waiter.dom_ready("after_login")
         
         # 로그인 성공 확인
         current_url = driver.current_url.lower()
@@ -298,6 +639,97 @@ def login(driver: webdriver.Chrome, user_id: str, password: str) -> bool:
         return False
 
 
+def login_with_http(driver: webdriver.Chrome, user_id: str, password: str) -> bool:
+    """
+    requests 기반 로그인 후 세션 쿠키를 브라우저에 주입 (로그인 UI 생략)
+
+    AuthController.login으로 얻은 쿠키 jar(www/ol/el 서브도메인 포함)를
+    CDP Network.setCookie로 설정하므로 페이지 이동 없이 바로 game645.do로 갈 수 있다.
+
+    Args:
+        driver: WebDriver 인스턴스
+        user_id: 사용자 ID
+        password: 비밀번호
+
+    Returns:
+        로그인 및 쿠키 주입 성공 여부
+    """
+    print("🔐 HTTP 로그인 후 브라우저에 세션 주입 중...")
+
+    try:
+        auth_ctrl = auth.AuthController(HttpClientPool.get(f"selenium:{user_id}"))
+        if not auth_ctrl.login(user_id, password):
+            print("❌ HTTP 로그인 실패")
+            return False
+
+        injected = 0
+        for cookie in auth_ctrl.http_client.session.cookies:
+            params = {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path or "/",
+                "secure": bool(cookie.secure),
+            }
+            if cookie.expires:
+                params["expires"] = cookie.expires
+            driver.execute_cdp_cmd("Network.setCookie", params)
+            injected += 1
+
+        print(f"✓ 세션 쿠키 {injected}개 주입 완료")
+        return injected > 0
+
+    except Exception as e:
+        print(f"❌ HTTP 로그인/쿠키 주입 실패 - {e}")
+        return False
+
+
+def ready_for_next_round(driver: webdriver.Chrome, fresh_state: dict) -> bool:
+    """
+    구매 완료 후 같은 페이지에서 바로 다음 라운드를 진행할 수 있는지 확인
+
+    남아 있는 구매 결과/확인 레이어를 닫은 뒤, 구매 후 바뀌는 상태(영수증 레이어, 구매 버튼,
+    선택된 번호/슬롯, 결제 금액)가 새로 로드했을 때의 상태(fresh_state)로 돌아왔는지 확인한다.
+    번호 선택 영역 같은 정적 요소는 구매 후에도 남아 있으므로 판단에 쓰지 않는다.
+
+    Args:
+        fresh_state: 페이지를 새로 로드하고 구매 영역에 들어간 직후의 purchase_state()
+
+    Returns:
+        새로고침 없이 진행 가능하면 True (False면 game645.do를 다시 로드해야 함)
+    """
+    if not fresh_state:
+        return False
+
+    try:
+        driver.switch_to.alert.accept()
+    except NoAlertPresentException:
+        pass
+    except Exception:
+        return False
+
+    try:
+        still_open = driver.execute_script(_CLOSE_RESULT_LAYERS_SCRIPT)
+    except Exception as e:
+        print(f"⚠️ 결과 레이어 정리 실패: {e}")
+        return False
+
+    if still_open:
+        print(f"ℹ️ 닫히지 않은 레이어: {still_open}")
+        return False
+
+    state = purchase_state(driver)
+    if state is None or state["receipt_open"]:
+        return False
+
+    changed = [key for key in ("buy_enabled", "checked", "amount", "filled_slots") if state.get(key) != fresh_state.get(key)]
+    if changed:
+        print(f"ℹ️ 구매 영역이 초기화되지 않음: {', '.join(changed)}")
+        return False
+
+    return probe_page_state(driver) == PageState.READY
+
+
 def navigate_to_lotto645(driver: webdriver.Chrome) -> bool:
     """
     로또645 구매 페이지로 이동
@@ -309,13 +741,18 @@ def navigate_to_lotto645(driver: webdriver.Chrome) -> bool:
         이동 성공 여부
     """
     print("🎰 로또645 페이지로 이동 중...")
+    waiter = get_waiter(driver)
     
     try:
         # 로또645 구매 페이지로 이동
-        driver.get("https://ol.dhlottery.co.kr/olotto/game/game645.do")
+        browser_profile.navigate(driver, "https://ol.dhlottery.co.kr/olotto/game/game645.do", "game645")
         
-        # 페이지 로딩 대기
-        time.sleep(3)
+        # 페이지 로딩 대기 (구매 영역 또는 alert 중 먼저 나타나는 쪽, 판매 시간 외에는 최대 3초)
+        waiter.optional(
+            EC.any_of(EC.alert_is_present(), EC.presence_of_element_located((By.ID, "num1"))),
+            3,
+            "game645_loaded"
+        )
         
         # 알림 팝업 처리
         try:
@@ -324,21 +761,21 @@ def navigate_to_lotto645(driver: webdriver.Chrome) -> bool:
         except:
             pass
         
-        page_source = driver.page_source
+        state = probe_page_state(driver)
         
         # 구매 영역이 있으면 성공 (번호 선택 영역이나 구매 버튼)
-        if "번호선택" in page_source or "자동번호발급" in page_source or "ball645" in page_source:
+        if state == PageState.READY:
             print("✓ 로또645 페이지 접속 성공!")
             return True
         
-        # 판매 시간이 아닌 경우 (회차정보 없음 메시지)
-        if "존재하지 않습니다" in page_source or "회차정보가 존재하지" in page_source:
-            print("ℹ️ 현재 판매 시간이 아닙니다 (회차정보 없음)")
+        # 판매 시간이 아닌 경우 (회차정보 없음 / 구매 가능한 복권 없음)
+        if state in (PageState.NO_ROUND_INFO, PageState.CLOSED):
+            print(f"ℹ️ 현재 판매 시간이 아닙니다 ({state.value})")
             save_screenshot(driver, "05_no_round_info")
             return True  # 정상 - 판매 시간이 아닐 뿐
         
-        # 명확한 세션 만료 메시지만 체크
-        if "세션이 해제" in page_source and "시간 초과" in page_source:
+        # 세션 만료
+        if state == PageState.SESSION_EXPIRED:
             print("❌ 세션 만료됨!")
             return False
         
@@ -363,31 +800,40 @@ def open_purchase_popup(driver: webdriver.Chrome) -> bool:
         성공 여부
     """
     print("🎫 구매 영역 확인 중...")
+    waiter = get_waiter(driver)
     
     try:
-        # 먼저 popupLayerAlert 팝업이 있으면 닫기
-        try:
-            alert_popup = driver.find_element(By.CSS_SELECTOR, "#popupLayerAlert input.button[value='확인']")
-            driver.execute_script("arguments[0].click();", alert_popup)
-            print("ℹ️ 알림 팝업(popupLayerAlert) 닫음")
-            time.sleep(0.5)
-        except:
-            pass
+        # 먼저 popupLayerAlert 팝업이 있으면 닫기 (없으면 즉시 넘어감)
+        alert_popup = waiter.find_optional(By.CSS_SELECTOR, "#popupLayerAlert input.button[value='확인']", "probe_alert_popup")
+        if alert_popup is not None:
+            try:
+                driver.execute_script("arguments[0].click();", alert_popup)
+                print("ℹ️ 알림 팝업(popupLayerAlert) 닫음")
+                waiter.optional(
+                    EC.invisibility_of_element_located((By.ID, "popupLayerAlert")),
+                    2,
+                    "alert_popup_closed"
+                )
+            except Exception:
+                pass
         
         # 다른 팝업도 확인
-        try:
-            confirm_btn = driver.find_element(By.CSS_SELECTOR, ".btn_common, .popup_btn button, button.confirm")
-            confirm_btn.click()
-            print("ℹ️ 팝업 확인 버튼 클릭")
-            time.sleep(1)
-            save_screenshot(driver, "06_popup_confirmed")
-        except:
-            pass
+        confirm_btn = waiter.find_optional(By.CSS_SELECTOR, ".btn_common, .popup_btn button, button.confirm", "probe_confirm_popup")
+        if confirm_btn is not None:
+            try:
+                confirm_btn.click()
+                print("ℹ️ 팝업 확인 버튼 클릭")
+                waiter.network_idle("popup_confirmed")
+                save_screenshot(driver, "06_popup_confirmed")
+            except Exception:
+                pass
         
         # 자동번호발급 버튼 확인 시도
         try:
-            auto_btn = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.ID, "num1"))
+            auto_btn = waiter.until(
+                EC.presence_of_element_located((By.ID, "num1")),
+                5,
+                "auto_button"
             )
             print("✓ 자동번호발급 버튼 발견!")
             
@@ -395,7 +841,7 @@ def open_purchase_popup(driver: webdriver.Chrome) -> bool:
             try:
                 driver.execute_script("arguments[0].click();", auto_btn)
                 print("✓ 자동번호발급 버튼 클릭!")
-                time.sleep(1)
+                waiter.network_idle("auto_button_clicked")
                 save_screenshot(driver, "06_auto_btn_clicked")
             except Exception as e:
                 print(f"⚠️ 버튼 클릭 불가: {e}")
@@ -404,14 +850,14 @@ def open_purchase_popup(driver: webdriver.Chrome) -> bool:
             print("ℹ️ 자동번호발급 버튼 없음 (판매 시간 외)")
         
         # 현재 상태 확인
-        page_source = driver.page_source
+        state = probe_page_state(driver)
         
-        if "현재 구매 가능한 복권이 없습니다" in page_source:
+        if state == PageState.CLOSED:
             print("ℹ️ 현재 구매 가능한 복권이 없습니다 (판매 시간 외)")
             save_screenshot(driver, "06_no_lottery_available")
             return True  # 정상 동작 - 판매 시간이 아닐 뿐
         
-        if "존재하지 않습니다" in page_source or "회차정보" in page_source:
+        if state == PageState.NO_ROUND_INFO:
             print("ℹ️ 회차정보가 없습니다 (판매 시간 외)")
             return True  # 정상 - 판매 시간이 아닐 뿐
         
@@ -425,18 +871,15 @@ def open_purchase_popup(driver: webdriver.Chrome) -> bool:
 
 
 def save_screenshot(driver: webdriver.Chrome, name: str) -> None:
-    """스크린샷 저장"""
-    try:
-        # GitHub Actions 환경이면 workspace에 저장
-        output_dir = os.getenv('GITHUB_WORKSPACE', '.')
-        filepath = os.path.join(output_dir, f"screenshot_{name}.png")
-        driver.save_screenshot(filepath)
-        print(f"📸 스크린샷 저장: {filepath}")
-    except Exception as e:
-        print(f"⚠️ 스크린샷 저장 실패: {e}")
+    """
+    스크린샷 캡처 (링 버퍼에 보관, SCREENSHOT_LEVEL에 따라 실패 시 또는 즉시 백그라운드 기록)
+
+    GitHub Actions 환경이면 workspace에 저장
+    """
+    screenshots.get_recorder(driver).capture(name)
 
 
-def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url: str = None, mode: str = "auto") -> dict:
+def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url: str = None, mode: str = "auto", login_mode: str = None, screenshot_prefix: str = "") -> dict:
     """
     Selenium으로 로또 구매 실행 (최대 10게임 지원)
     
@@ -446,6 +889,9 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
         count: 구매 게임 수 (1-10, 기본값 10)
         sheet_api_url: 스프레드시트 API URL (수동 모드에서만 사용)
         mode: "auto" 또는 "manual"
+        login_mode: "browser"(로그인 UI 사용) 또는 "http"(HTTP 로그인 후 쿠키 주입),
+                    None이면 SELENIUM_LOGIN 환경변수 (기본값 browser)
+        screenshot_prefix: 스크린샷 파일명 접두어 (다중 계정 동시 실행 시 파일 충돌 방지)
     
     Returns:
         결과 딕셔너리 {"success": bool, "message": str, "games": list, "rounds": list}
@@ -458,6 +904,8 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
     }
     driver = None
     all_games = []
+    sheet_executor = None
+    sheet_future = None
     
     try:
         # 환경변수로 headless 모드 제어
@@ -469,57 +917,110 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
         print(f"   요청 게임 수: {count}게임")
         print("=" * 50)
         
-        # 수동 모드일 경우 먼저 번호 조회
+        # 수동 모드 번호 조회는 브라우저 시작/로그인과 독립적이므로 백그라운드에서 동시에 진행
+        # (환경변수나 로컬 파일 번호면 브라우저 시작 전에 검증까지 마침)
         if mode == "manual":
-            if not sheet_api_url:
-                result["message"] = "수동 모드에는 SHEET_API_URL이 필요합니다"
+            if not number_provider.is_configured(sheet_api_url):
+                result["message"] = "수동 모드에는 SHEET_API_URL, NUMBERS_FILE 또는 MANUAL_NUMBERS가 필요합니다"
                 return result
             
-            all_games = fetch_numbers_from_sheet(sheet_api_url, count=count)
-            if not all_games:
-                result["message"] = "스프레드시트에서 번호를 가져올 수 없습니다"
+            all_games = fetch_numbers_from_sheet(sheet_api_url, count=count, allow_network=False)
+            if all_games is None:
+                all_games = []
+                sheet_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet")
+                sheet_future = sheet_executor.submit(fetch_numbers_from_sheet, sheet_api_url, count=count)
+            elif not all_games:
+                result["message"] = "수동 번호를 가져올 수 없습니다"
                 return result
         
+        def sheet_failed() -> bool:
+            """번호 조회가 이미 끝났고 결과가 비어 있으면 True (기다리지 않음)"""
+            return sheet_future is not None and sheet_future.done() and not sheet_future.result()
+        
         # WebDriver 생성
-        driver = create_driver(headless=headless)
+        result["startup"] = {}
+        driver = create_driver(
+            headless=headless,
+            profile_dir=driver_provision.profile_dir_for(user_id),
+            report=result["startup"]
+        )
+        screenshots.attach(driver, prefix=screenshot_prefix)
+        
+        if sheet_failed():
+            result["message"] = "수동 번호를 가져올 수 없습니다"
+            return result
         
-        # 1. 로그인
-        if not login(driver, user_id, password):
+        # 1. 로그인 (http 모드는 실패 시 브라우저 로그인으로 대체)
+        login_mode = (login_mode or os.getenv("SELENIUM_LOGIN", "browser")).lower()
+        logged_in = login_mode == "http" and login_with_http(driver, user_id, password)
+        if not logged_in and not login(driver, user_id, password):
             result["message"] = "로그인 실패"
             return result
         
+        # 라운드 구성이 게임 수에 따라 정해지므로 번호 입력 전에 조회 결과를 기다림
+        if sheet_future is not None:
+            sheet_wait_started_at = time.monotonic()
+            all_games = sheet_future.result()
+            result["sheet_wait"] = round(time.monotonic() - sheet_wait_started_at, 2)
+            print(f"📊 번호 조회 대기: {result['sheet_wait']:.2f}초")
+            if not all_games:
+                result["message"] = "수동 번호를 가져올 수 없습니다"
+                return result
+        
         # 2. 라운드별 구매 (5게임씩)
         total_games = len(all_games) if mode == "manual" else count
         rounds_needed = (total_games + 4) // 5  # 올림 나눗셈
         purchased_games = []
+        fresh_state = None
         
         for round_num in range(1, rounds_needed + 1):
             start_idx = (round_num - 1) * 5
             end_idx = min(round_num * 5, total_games)
             round_games = all_games[start_idx:end_idx] if mode == "manual" else []
             games_in_round = end_idx - start_idx
+            round_started_at = time.monotonic()
             
             print(f"\n{'='*50}")
             print(f"📦 라운드 {round_num}/{rounds_needed}: 게임 {start_idx+1}~{end_idx}")
             print(f"{'='*50}")
             
-            # 로또645 페이지 이동
-            if not navigate_to_lotto645(driver):
-                result["message"] = f"라운드 {round_num}: 로또645 페이지 이동 실패"
-                result["rounds"].append({"round": round_num, "success": False, "games": []})
-                break
+            # 이전 라운드 구매 후 같은 페이지가 다시 구매 가능한 상태면 새로고침 없이 진행
+            reload_needed = round_num == 1 or not ready_for_next_round(driver, fresh_state)
+            
+            def finish_round(success: bool, games: list) -> None:
+                result["rounds"].append({
+                    "round": round_num,
+                    "success": success,
+                    "games": games,
+                    "count": len(games) or games_in_round,
+                    "reloaded": reload_needed,
+                    "elapsed": round(time.monotonic() - round_started_at, 2),
+                })
+            
+            if reload_needed:
+                # 로또645 페이지 이동
+                if not navigate_to_lotto645(driver):
+                    result["message"] = f"라운드 {round_num}: 로또645 페이지 이동 실패"
+                    finish_round(False, [])
+                    break
+            else:
+                print("♻️ 페이지 새로고침 없이 다음 라운드 진행")
             
             # 구매 영역 접근
             if not open_purchase_popup(driver):
                 result["message"] = f"라운드 {round_num}: 구매 영역 접근 실패"
-                result["rounds"].append({"round": round_num, "success": False, "games": []})
+                finish_round(False, [])
                 break
             
+            # 새로 로드한 페이지의 구매 영역 상태를 기준으로 다음 라운드의 초기화 여부 판단
+            if reload_needed:
+                fresh_state = purchase_state(driver)
+            
             # 번호 선택
             if mode == "manual" and round_games:
                 if not buy_manual(driver, round_games):
                     result["message"] = f"라운드 {round_num}: 수동 번호 입력 실패"
-                    result["rounds"].append({"round": round_num, "success": False, "games": round_games})
+                    finish_round(False, round_games)
                     break
             else:
                 print(f"🎲 자동 모드: {games_in_round}게임 자동 선택")
@@ -528,28 +1029,35 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
             # 구매하기 버튼 클릭
             if not click_purchase_button(driver):
                 result["message"] = f"라운드 {round_num}: 구매하기 버튼 클릭 실패"
-                result["rounds"].append({"round": round_num, "success": False, "games": round_games})
+                finish_round(False, round_games)
                 break
             
+            # 페이지가 받은 execBuy.do 응답에서 실제 구매 회차/번호 확인
+            exec_buy_results = [r.get("result", {}) for r in capture_exec_buy_responses(driver)]
+            if exec_buy_results:
+                failed = [r for r in exec_buy_results if r.get("resultMsg", "FAILURE").upper() != "SUCCESS"]
+                if failed:
+                    result["message"] = f"라운드 {round_num}: 구매 실패 ({failed[0].get('resultMsg')})"
+                    finish_round(False, round_games)
+                    break
+
+                result["buy_round"] = exec_buy_results[-1].get("buyRound")
+                round_games = [
+                    {"game": g["game"], "numbers": g["numbers"]}
+                    for r in exec_buy_results
+                    for g in lotto645.Lotto645.parse_game_choice_nums(r.get("arrGameChoiceNum"))
+                ]
+            
             # 라운드 성공
-            print(f"✅ 라운드 {round_num} 구매 완료! ({games_in_round}게임)")
-            result["rounds"].append({
-                "round": round_num, 
-                "success": True, 
-                "games": round_games
-            })
+            finish_round(True, round_games)
+            print(f"✅ 라운드 {round_num} 구매 완료! ({games_in_round}게임, {result['rounds'][-1]['elapsed']}초)")
             purchased_games.extend(round_games)
             
             save_screenshot(driver, f"round{round_num}_completed")
-            
-            # 다음 라운드가 있으면 잠시 대기
-            if round_num < rounds_needed:
-                print("   ⏳ 다음 라운드 준비 중...")
-                time.sleep(2)
         
         # 최종 결과
         successful_rounds = [r for r in result["rounds"] if r["success"]]
-        total_purchased = sum(len(r.get("games", [])) for r in successful_rounds)
+        total_purchased = sum(r.get("count", len(r.get("games", []))) for r in successful_rounds)
         
         print(f"\n{'='*50}")
         print(f"🎉 구매 완료!")
@@ -557,9 +1065,24 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
         print(f"   구매 게임 수: {total_purchased}게임")
         print(f"{'='*50}")
         
-        result["success"] = len(successful_rounds) > 0
-        result["message"] = f"{total_purchased}게임 구매 완료"
-        result["games"] = purchased_games
+        # 일부 라운드만 성공하면 성공으로 보지 않고 요청/구매 게임 수와 실패 사유를 남김
+        failure_message = result["message"]
+        result["requested"] = total_games
+        result["count"] = total_purchased
+        if total_purchased >= total_games and len(successful_rounds) == rounds_needed:
+            result["status"] = "success"
+            result["message"] = f"{total_purchased}게임 구매 완료"
+        elif successful_rounds:
+            result["status"] = "partial"
+            result["message"] = f"일부 구매: {total_purchased}/{total_games}게임 ({failure_message or '일부 라운드 실패'})"
+        else:
+            result["status"] = "failed"
+            result["message"] = failure_message or "구매 실패"
+        result["success"] = result["status"] == "success"
+        result["games"] = [
+            {"game": index, "numbers": game["numbers"]}
+            for index, game in enumerate(purchased_games, start=1)
+        ]
         
     except Exception as e:
         print(f"❌ 예외 발생: {e}")
@@ -568,8 +1091,22 @@ def run_selenium_buy(user_id: str, password: str, count: int = 10, sheet_api_url
             save_screenshot(driver, "error_exception")
     
     finally:
+        if sheet_executor:
+            # 조기 종료 시 진행 중인 번호 조회를 기다리지 않음 (requests 타임아웃으로 스스로 종료)
+            sheet_executor.shutdown(wait=False)
         if driver:
+            waiter = get_waiter(driver)
+            waiter.print_summary()
+            result["waits"] = waiter.summary()
+            browser_profile.print_navigation_summary(driver)
+            result["navigations"] = browser_profile.navigation_summary(driver)
             save_screenshot(driver, "99_final_state")
+
+            # 실패한 실행만 버퍼의 최근 프레임을 디스크에 기록
+            recorder = screenshots.get_recorder(driver)
+            if not result["success"]:
+                recorder.flush()
+            recorder.close()
             driver.quit()
             print("🔚 브라우저 종료")
     
@@ -0,0 +1,146 @@
+"""
+Selenium 대기 전략 모듈
+
+고정 time.sleep 대신 WebDriverWait 기반의 명시적 조건(DOM 준비, 네트워크 유휴, alert)으로
+대기하고, 각 대기가 실제로 얼마나 블로킹했는지 기록한다.
+
+SELENIUM_SPEED 환경변수(fast | normal | slow)로 모든 대기 타임아웃을 일괄 조정한다.
+"""
+
+import os
+import time
+import weakref
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 프로파일별 타임아웃 배율 (조건이 빨리 만족되면 배율과 무관하게 즉시 반환)
+SPEED_PROFILES = {
+    "fast": 0.5,
+    "normal": 1.0,
+    "slow": 2.0,
+}
+
+_POLL_FREQUENCY = 0.1
+
+# 리소스 수가 idle_ms 동안 변하지 않고 jQuery AJAX가 없으면 네트워크 유휴로 판단
+_NETWORK_IDLE_SCRIPT = """
+var idleMs = arguments[0];
+var count = performance.getEntriesByType('resource').length;
+var now = Date.now();
+if (window.__lottoResCount !== count) {
+    window.__lottoResCount = count;
+    window.__lottoResAt = now;
+}
+var ajax = (window.jQuery && window.jQuery.active) || 0;
+return document.readyState !== 'loading' && ajax === 0 && (now - window.__lottoResAt) >= idleMs;
+"""
+
+
+class Waiter:
+    def __init__(self, driver, profile: str = None):
+        self.driver = driver
+        self.profile = (profile or os.getenv("SELENIUM_SPEED", "normal")).lower()
+        if self.profile not in SPEED_PROFILES:
+            raise ValueError(f"Unknown SELENIUM_SPEED: {self.profile} (choose from {', '.join(SPEED_PROFILES)})")
+        self.records = []
+
+    def until(self, condition, timeout: float, label: str):
+        """
+        조건이 만족될 때까지 대기 (타임아웃 시 TimeoutException)
+
+        Args:
+            condition: WebDriverWait.until에 전달할 조건 (expected_conditions 또는 callable)
+            timeout: normal 프로파일 기준 최대 대기 시간(초)
+            label: 기록용 이름
+        """
+        scaled = timeout * SPEED_PROFILES[self.profile]
+        started_at = time.monotonic()
+        try:
+            value = WebDriverWait(self.driver, scaled, poll_frequency=_POLL_FREQUENCY).until(condition)
+        except TimeoutException:
+            self._record(label, started_at, timed_out=True)
+            raise
+        self._record(label, started_at, timed_out=False)
+        return value
+
+    def optional(self, condition, timeout: float, label: str):
+        """until과 같지만 타임아웃 시 None 반환"""
+        try:
+            return self.until(condition, timeout, label)
+        except TimeoutException:
+            return None
+
+    def dom_ready(self, label: str, timeout: float = 10):
+        return self.optional(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"),
+            timeout,
+            label,
+        )
+
+    def network_idle(self, label: str, idle_ms: int = 300, timeout: float = 10):
+        return self.optional(
+            lambda d: d.execute_script(_NETWORK_IDLE_SCRIPT, idle_ms),
+            timeout,
+            label,
+        )
+
+    def find_optional(self, by: str, selector: str, label: str):
+        """
+        있을 수도 없을 수도 있는 요소 조회 (대기 없이 즉시 반환)
+
+        드라이버의 implicit wait이 0이어야 없는 요소에서 지연되지 않는다.
+
+        Returns:
+            첫 번째 요소, 없으면 None
+        """
+        started_at = time.monotonic()
+        elements = self.driver.find_elements(by, selector)
+        self._record(label, started_at, timed_out=False)
+        return elements[0] if elements else None
+
+    def summary(self) -> dict:
+        """
+        대기 기록 요약
+
+        Returns:
+            {"profile", "total_blocked", "timeouts", "timeout_blocked", "waits": [{"label", "blocked", "timed_out"}, ...]}
+            timeout_blocked: 요소/조건을 끝내 찾지 못해 타임아웃까지 기다린 시간의 합
+        """
+        return {
+            "profile": self.profile,
+            "total_blocked": round(sum(r["blocked"] for r in self.records), 2),
+            "timeouts": sum(1 for r in self.records if r["timed_out"]),
+            "timeout_blocked": round(sum(r["blocked"] for r in self.records if r["timed_out"]), 2),
+            "waits": list(self.records),
+        }
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print(
+            f"⏱️ 대기 요약 ({summary['profile']}): 총 {summary['total_blocked']:.2f}초, "
+            f"타임아웃 {summary['timeouts']}회 ({summary['timeout_blocked']:.2f}초 손실)"
+        )
+        for record in sorted(self.records, key=lambda r: r["blocked"], reverse=True)[:5]:
+            mark = " (timeout)" if record["timed_out"] else ""
+            print(f"   {record['label']}: {record['blocked']:.2f}초{mark}")
+
+    def _record(self, label: str, started_at: float, timed_out: bool) -> None:
+        self.records.append({
+            "label": label,
+            "blocked": round(time.monotonic() - started_at, 3),
+            "timed_out": timed_out,
+        })
+
+
+_waiters = weakref.WeakKeyDictionary()
+
+
+def get_waiter(driver) -> Waiter:
+    """드라이버별 Waiter (같은 드라이버에는 같은 기록을 공유)"""
+    waiter = _waiters.get(driver)
+    if waiter is None:
+        # Waiter가 드라이버를 강하게 참조하면 WeakKeyDictionary 항목이 해제되지 않으므로 proxy 사용
+        waiter = Waiter(weakref.proxy(driver))
+        _waiters[driver] = waiter
+    return waiter
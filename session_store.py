@@ -0,0 +1,108 @@
+"""
+로그인 세션 디스크 캐시 (암호화 저장)
+
+SESSION_STORE_DIR 환경변수가 설정된 경우에만 사용된다.
+쿠키 jar와 DHJSESSIONID를 Fernet(AES)으로 암호화해 계정별 파일에 저장하고,
+다음 실행에서 복원하여 RSA 로그인 과정을 건너뛴다.
+
+암호화 키는 SESSION_STORE_KEY 환경변수, 없으면 계정 비밀번호에서 PBKDF2로 유도한다.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+
+class SessionStore:
+    _KDF_ITERATIONS = 100000
+
+    def __init__(self, directory: str, secret: str):
+        assert type(directory) == str
+        assert type(secret) == str
+
+        self.directory = directory
+        self._secret = secret.encode("utf-8")
+
+    @staticmethod
+    def from_env(password: str):
+        """SESSION_STORE_DIR이 설정되어 있으면 SessionStore, 아니면 None 반환"""
+        directory = os.environ.get("SESSION_STORE_DIR", "")
+        if not directory:
+            return None
+
+        secret = os.environ.get("SESSION_STORE_KEY") or password
+        return SessionStore(directory, secret)
+
+    def save(self, user_id: str, cookies: list, auth_cred: str, login_seconds: float) -> None:
+        """
+        세션 저장
+
+        Args:
+            user_id: 사용자 ID
+            cookies: [{"name", "value", "domain", "path", "secure", "expires"}, ...]
+            auth_cred: DHJSESSIONID
+            login_seconds: 전체 로그인에 걸린 시간 (복원 시 절약 시간 계산용)
+        """
+        payload = json.dumps({
+            "cookies": cookies,
+            "auth_cred": auth_cred,
+            "login_seconds": login_seconds,
+            "saved_at": time.time(),
+        }).encode("utf-8")
+
+        salt = os.urandom(16)
+        token = Fernet(self._derive_key(salt)).encrypt(payload)
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(user_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"salt": salt.hex(), "token": token.decode("ascii")}, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+
+    def load(self, user_id: str):
+        """
+        세션 복원
+
+        Returns:
+            저장된 세션 딕셔너리, 없거나 복호화에 실패하면 None
+        """
+        path = self._path(user_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            key = self._derive_key(bytes.fromhex(stored["salt"]))
+            return json.loads(Fernet(key).decrypt(stored["token"].encode("ascii")))
+        except (OSError, ValueError, KeyError, InvalidToken) as e:
+            print(f"Warning: Could not restore stored session: {type(e).__name__} {e}")
+            return None
+
+    def delete(self, user_id: str) -> None:
+        try:
+            os.remove(self._path(user_id))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, user_id: str) -> str:
+        # 파일명에 계정 ID가 드러나지 않도록 해시 사용
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"session_{digest}.json")
+
+    def _derive_key(self, salt: bytes) -> bytes:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=self._KDF_ITERATIONS,
+        )
+        return base64.urlsafe_b64encode(kdf.derive(self._secret))
@@ -0,0 +1,179 @@
+"""
+백그라운드 웹훅 전송
+
+메시지를 큐에 넣고 바로 반환하며, 웹훅 URL마다 하나의 전송 스레드(lane)가 순서대로 보낸다.
+같은 URL로 가는 메시지는 순서가 유지되고, 서로 다른 URL은 동시에 전송된다.
+연결은 requests.Session 풀로 재사용하고, 429 응답은 Retry-After만큼 기다린 뒤 재시도한다.
+프로세스 종료 시(atexit) 남은 메시지를 제한 시간 안에서 전송한다.
+
+환경변수:
+    WEBHOOK_CONNECT_TIMEOUT / WEBHOOK_READ_TIMEOUT: 요청 타임아웃 (기본값 5 / 10초)
+    WEBHOOK_MAX_RETRIES: 429/5xx/연결 오류 재시도 횟수 (기본값 3)
+    WEBHOOK_MAX_RETRY_AFTER: Retry-After 최대 대기 시간 (기본값 30초)
+    WEBHOOK_FLUSH_TIMEOUT: 종료 시 남은 메시지 전송 제한 시간 (기본값 15초)
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+from concurrent.futures import Future, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class WebhookDispatcher:
+    def __init__(self):
+        self.timeout = (
+            float(os.getenv("WEBHOOK_CONNECT_TIMEOUT", "5")),
+            float(os.getenv("WEBHOOK_READ_TIMEOUT", "10")),
+        )
+        self.max_retries = int(os.getenv("WEBHOOK_MAX_RETRIES", "3"))
+        self.max_retry_after = float(os.getenv("WEBHOOK_MAX_RETRY_AFTER", "30"))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lanes = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        # flush 중에는 이 시각을 넘겨 Retry-After/백오프 대기를 하지 않음
+        self._deadline = None
+
+    def submit(self, webhook_url: str, payload: dict, label: str = "") -> Future:
+        """
+        메시지 전송 예약 (즉시 반환)
+
+        Returns:
+            Future - 결과 {"label", "status", "status_code", "attempts", "latency", "error"}
+            status: "sent" | "failed"
+        """
+        future = Future()
+        with self._lock:
+            self._pending.add(future)
+            lane = self._lanes.get(webhook_url)
+            if lane is None:
+                lane = queue.Queue()
+                thread = threading.Thread(target=self._run_lane, args=(webhook_url, lane), name="webhook", daemon=True)
+                self._lanes[webhook_url] = lane
+                thread.start()
+        future.add_done_callback(self._discard)
+        lane.put((payload, label, future, time.monotonic()))
+        return future
+
+    def flush(self, timeout: float = None) -> dict:
+        """
+        대기 중인 메시지가 전송될 때까지 최대 timeout초 대기
+
+        Returns:
+            {"sent": int, "failed": int, "pending": int}
+        """
+        if timeout is None:
+            timeout = float(os.getenv("WEBHOOK_FLUSH_TIMEOUT", "15"))
+
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return {"sent": 0, "failed": 0, "pending": 0}
+
+        self._deadline = time.monotonic() + timeout
+        try:
+            done, not_done = wait(pending, timeout=timeout)
+        finally:
+            self._deadline = None
+
+        sent = sum(1 for f in done if f.result()["status"] == "sent")
+        summary = {"sent": sent, "failed": len(done) - sent, "pending": len(not_done)}
+        if summary["failed"] or summary["pending"]:
+            print(f"⚠️ 웹훅 전송: 성공 {summary['sent']}, 실패 {summary['failed']}, 미전송 {summary['pending']}")
+        return summary
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def _run_lane(self, webhook_url: str, lane: queue.Queue) -> None:
+        while True:
+            payload, label, future, queued_at = lane.get()
+            try:
+                future.set_result(self._deliver(webhook_url, payload, label, queued_at))
+            except Exception as e:
+                future.set_result({
+                    "label": label, "status": "failed", "status_code": None,
+                    "attempts": 0, "latency": round(time.monotonic() - queued_at, 3), "error": str(e),
+                })
+
+    def _deliver(self, webhook_url: str, payload: dict, label: str, queued_at: float) -> dict:
+        status_code = None
+        error = None
+        attempts = 0
+
+        while attempts <= self.max_retries:
+            attempts += 1
+            delay = None
+            try:
+                response = self.session.post(webhook_url, json=payload, timeout=self.timeout)
+                status_code = response.status_code
+                if status_code < 300:
+                    error = None
+                    break
+                error = f"HTTP {status_code}"
+                if status_code == 429:
+                    delay = self._retry_after(response)
+                elif status_code < 500:
+                    break
+            except requests.RequestException as e:
+                error = type(e).__name__
+
+            delay = delay if delay is not None else min(2 ** (attempts - 1), self.max_retry_after)
+            if attempts > self.max_retries or not self._sleep(delay):
+                break
+
+        return {
+            "label": label,
+            "status": "sent" if error is None else "failed",
+            "status_code": status_code,
+            "attempts": attempts,
+            "latency": round(time.monotonic() - queued_at, 3),
+            "error": error,
+        }
+
+    def _retry_after(self, response) -> float:
+        """Retry-After 헤더(초) 또는 Discord 본문의 retry_after"""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            try:
+                value = response.json().get("retry_after")
+            except ValueError:
+                value = None
+        try:
+            return min(float(value), self.max_retry_after)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _sleep(self, delay: float) -> bool:
+        """delay초 대기, flush 제한 시간을 넘기게 되면 대기하지 않고 False"""
+        deadline = self._deadline
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> WebhookDispatcher:
+    """프로세스 공용 WebhookDispatcher (최초 호출 시 생성, 종료 시 flush 등록)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = WebhookDispatcher()
+            atexit.register(_dispatcher.flush)
+        return _dispatcher
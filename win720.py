@@ -1,19 +1,22 @@
+import os
 import json
 import datetime
 import base64
 import requests
 
 from enum import Enum
-from bs4 import BeautifulSoup as BS
+from bs4 import SoupStrainer
 from datetime import timedelta
 from Crypto.Cipher import AES
 from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Hash import SHA256
 from Crypto.Random import get_random_bytes
 
-from HttpClient import HttpClientSingleton
+from html_parser import make_soup, table_body
+from HttpClient import HttpClient, HttpClientSingleton
 
 import auth
+import draw_calendar
 
 class Win720:
 
@@ -44,8 +47,8 @@ class Win720:
         "X-Requested-With": "XMLHttpRequest"
     }
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    def __init__(self, http_client: HttpClient = None):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
     def buy_Win720(
         self, 
@@ -74,11 +77,20 @@ class Win720:
         return auth_ctrl.add_auth_cred_to_headers(self._REQ_HEADERS)
 
     def _get_round(self) -> str:
+        """구매할 회차 (오프라인 달력 계산, ROUND_VERIFY=true면 메인 페이지로 검증)"""
+        round_no = str(draw_calendar.current_round(draw_calendar.WIN720))
+        if os.environ.get("ROUND_VERIFY", "false").lower() != "true":
+            return round_no
+
+        scraped = self._scrape_round()
+        if scraped != round_no:
+            print(f"Warning: Round calendar mismatch (calendar={round_no}, scraped={scraped})")
+        return scraped
+
+    def _scrape_round(self) -> str:
         res = self.http_client.get("https://www.dhlottery.co.kr/common.do?method=main")
         html = res.text
-        soup = BS(
-            html, "html5lib"
-        )  # 'html5lib' : in case that the html don't have clean tag pairs
+        soup = make_soup(html, SoupStrainer("strong", id="drwNo720"))
         last_drawn_round = int(soup.find("strong", id="drwNo720").text)
         return str(last_drawn_round + 1)
 
@@ -166,9 +178,7 @@ class Win720:
         )
 
         html = res.text
-        soup = BS(
-            html, "html5lib"
-        )
+        soup = make_soup(html, SoupStrainer("p", class_="total_new"))
         balance = soup.find("p", class_="total_new").find('strong').text
         return balance
 
@@ -194,9 +204,9 @@ class Win720:
         )
 
         html = res.text
-        soup = BS(html, "html5lib")
+        soup = make_soup(html, SoupStrainer("table", class_="tbl_data tbl_data_col"))
         
-        winnings = soup.find("table", class_="tbl_data tbl_data_col").find_all("tbody")[0].find_all("td")       
+        winnings = table_body(soup.find("table", class_="tbl_data tbl_data_col")).find_all("td")       
 
         result_data = {
             "data": "no winning data"